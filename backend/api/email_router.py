@@ -1,9 +1,14 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 from typing import Dict, List, Optional
-from sqlalchemy import or_
+import asyncio
+from collections import defaultdict
+from sqlalchemy import or_, func, case
+from sqlalchemy.orm import selectinload, load_only
 from backend.services.email_cache_service import EmailCacheService
 from backend.services.email_classification_service import EmailClassificationService
 from backend.lib.config_manager import config_manager
+from backend.lib import serialization
 from backend.database.config import SessionLocal
 from backend.database.models import Email, EmailContent, Trip
 from backend.constants import TRAVEL_CATEGORIES
@@ -15,34 +20,42 @@ router = APIRouter()
 email_cache_service = EmailCacheService()
 classification_service = EmailClassificationService()
 
+def _booking_type_expr():
+    """SQL expression for extracted_booking_info's booking_type, NULL when the stored text is not valid JSON"""
+    return case(
+        (func.json_valid(EmailContent.extracted_booking_info) == 1,
+         func.json_extract(EmailContent.extracted_booking_info, '$.booking_type')),
+        else_=None
+    )
+
 def get_trip_detection_stats(db, booking_completed_count):
     """Get trip detection statistics"""
     try:
-        # Trip detection status counts
-        trip_pending_count = db.query(EmailContent).filter_by(trip_detection_status='pending').count()
-        trip_processing_count = db.query(EmailContent).filter_by(trip_detection_status='processing').count()
-        trip_completed_count = db.query(EmailContent).filter_by(trip_detection_status='completed').count()
-        trip_failed_count = db.query(EmailContent).filter_by(trip_detection_status='failed').count()
+        # Trip detection status counts, grouped on the bare column without loading entities
+        trip_status_counts = dict(
+            db.query(EmailContent.trip_detection_status, func.count(EmailContent.id))
+            .group_by(EmailContent.trip_detection_status)
+            .all()
+        )
+        trip_pending_count = trip_status_counts.get('pending', 0)
+        trip_processing_count = trip_status_counts.get('processing', 0)
+        trip_completed_count = trip_status_counts.get('completed', 0)
+        trip_failed_count = trip_status_counts.get('failed', 0)
         
         # Count detected trips
-        total_trips = db.query(Trip).count()
+        total_trips = db.query(func.count(Trip.id)).scalar()
         
         # Count emails with actual booking info (non-null booking_type)
         booking_emails_count = 0
         if booking_completed_count > 0:
             # Get count of emails with actual booking information (not just completed extraction)
-            booking_emails = db.query(EmailContent).filter(
+            # Filter on booking_type in the database instead of loading and parsing every row
+            booking_type = _booking_type_expr()
+            booking_emails_count = db.query(func.count(EmailContent.id)).filter(
                 EmailContent.booking_extraction_status == 'completed',
-                EmailContent.extracted_booking_info.isnot(None)
-            ).all()
-            
-            for email_content in booking_emails:
-                try:
-                    booking_info = json.loads(email_content.extracted_booking_info)
-                    if booking_info.get('booking_type'):  # Has actual booking info
-                        booking_emails_count += 1
-                except:
-                    continue
+                booking_type.isnot(None),
+                booking_type != ''
+            ).scalar()
         
         return {
             'pending': trip_pending_count,
@@ -216,13 +229,35 @@ async def start_email_import_days(request: dict) -> Dict:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/import/progress")
-async def get_import_progress() -> Dict:
+async def get_import_progress() -> Response:
     """Get current import progress"""
     try:
-        return email_cache_service.get_import_progress()
+        # Polled every second: encode the flat progress dict directly instead of
+        # going through FastAPI's generic jsonable_encoder walk
+        return Response(content=serialization.dumps(email_cache_service.get_import_progress()),
+                        media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/import/progress/stream")
+async def stream_import_progress():
+    """Stream import progress as Server-Sent Events until the import stops running"""
+    async def events():
+        last_payload = None
+        while True:
+            progress = email_cache_service.get_import_progress()
+            payload = serialization.dumps(progress)
+            # Only push when something changed
+            if payload != last_payload:
+                yield f"data: {payload}\n\n"
+                last_payload = payload
+            if progress.get('finished') or not progress.get('is_running'):
+                break
+            await asyncio.sleep(0.5)
+    
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
 @router.post("/import/stop")
 async def stop_import() -> Dict:
     """Stop ongoing import process"""
@@ -442,7 +477,7 @@ async def set_log_level(request: dict) -> Dict:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/list")
-async def list_emails(
+def list_emails(
     classification: Optional[str] = Query(None, description="Filter by classification type"),
     limit: Optional[int] = Query(100, description="Maximum number of emails to return"),
     offset: Optional[int] = Query(0, description="Number of emails to skip"),
@@ -469,10 +504,8 @@ async def list_emails(
                 # Special filter for emails that have actual booking information
                 query = query.join(EmailContent).filter(
                     EmailContent.booking_extraction_status == 'completed',
-                    EmailContent.extracted_booking_info.isnot(None),
-                    EmailContent.extracted_booking_info != 'null',
-                    EmailContent.extracted_booking_info.contains('"booking_type"')
-                ).filter(~EmailContent.extracted_booking_info.contains('"booking_type": null'))
+                    _booking_type_expr().isnot(None)
+                )
             else:
                 query = query.join(EmailContent).filter(EmailContent.booking_extraction_status == booking_status)
         
@@ -497,22 +530,32 @@ async def list_emails(
         total_count = query.count()
         
         # Apply offset, limit and order by date
-        emails = query.order_by(Email.timestamp.desc()).offset(offset).limit(limit).all()
+        # Load the page's EmailContent rows in one extra query instead of one per email,
+        # reading only the columns listed below (not the email body or extracted content)
+        emails = query.options(
+            load_only(
+                Email.email_id, Email.subject, Email.sender, Email.date,
+                Email.timestamp, Email.classification
+            ),
+            selectinload(Email.email_content).load_only(
+                EmailContent.extraction_status, EmailContent.has_attachments,
+                EmailContent.attachments_count, EmailContent.booking_extraction_status,
+                EmailContent.trip_detection_status, EmailContent.extracted_booking_info
+            )
+        ).order_by(Email.timestamp.desc()).offset(offset).limit(limit).all()
         
         # Check for extracted content and booking info for each email
         email_list = []
         for email in emails:
             # Check if content has been extracted (any status, not just 'completed')
-            content_info = db.query(EmailContent).filter_by(
-                email_id=email.email_id
-            ).first()
+            content_info = email.email_content
             
             # Parse extracted booking info if available
             booking_info = None
             booking_summary = None
             if content_info and content_info.extracted_booking_info:
                 try:
-                    booking_info = json.loads(content_info.extracted_booking_info)
+                    booking_info = serialization.loads(content_info.extracted_booking_info)
                     booking_summary = _create_booking_summary(booking_info)
                 except:
                     booking_info = None
@@ -550,7 +593,7 @@ async def list_emails(
         db.close()
 
 @router.get("/{email_id}/booking-info")
-async def get_email_booking_info(email_id: str) -> Dict:
+def get_email_booking_info(email_id: str) -> Dict:
     """Get detailed booking information for a specific email"""
     db = SessionLocal()
     try:
@@ -603,7 +646,7 @@ async def get_email_booking_info(email_id: str) -> Dict:
         db.close()
 
 @router.get("/stats/detailed")
-async def get_detailed_email_stats() -> Dict:
+def get_detailed_email_stats() -> Dict:
     """获取详细的邮件统计信息"""
     try:
         db = SessionLocal()
@@ -614,29 +657,20 @@ async def get_detailed_email_stats() -> Dict:
         # 日期范围 - 使用timestamp字段而不是date字段
         date_range = None
         if total_emails > 0:
-            oldest_email = db.query(Email).filter(Email.timestamp.isnot(None)).order_by(Email.timestamp.asc()).first()
-            newest_email = db.query(Email).filter(Email.timestamp.isnot(None)).order_by(Email.timestamp.desc()).first()
-            if oldest_email and newest_email:
+            oldest, newest = db.query(
+                func.min(Email.timestamp),
+                func.max(Email.timestamp)
+            ).filter(Email.timestamp.isnot(None)).one()
+            if oldest and newest:
                 date_range = {
-                    'oldest': oldest_email.timestamp.strftime('%Y-%m-%d') if oldest_email.timestamp else None,
-                    'newest': newest_email.timestamp.strftime('%Y-%m-%d') if newest_email.timestamp else None
+                    'oldest': oldest.strftime('%Y-%m-%d'),
+                    'newest': newest.strftime('%Y-%m-%d')
                 }
         
-        # 分类统计 - 处理None和unclassified
-        from sqlalchemy import or_
-        classified_count = db.query(Email).filter(
-            Email.classification.isnot(None),
-            Email.classification != 'unclassified'
-        ).count()
-        unclassified_count = db.query(Email).filter(
-            or_(Email.classification.is_(None), Email.classification == 'unclassified')
-        ).count()
-        
         # 各分类详细统计
         classification_stats = {}
         
         # 查询所有分类及其数量
-        from sqlalchemy import func
         classification_counts = db.query(
             Email.classification,
             func.count(Email.email_id).label('count')
@@ -646,7 +680,11 @@ async def get_detailed_email_stats() -> Dict:
             # Convert None to 'unclassified' for consistency
             if classification is None:
                 classification = 'unclassified'
-            classification_stats[classification] = count
+            classification_stats[classification] = classification_stats.get(classification, 0) + count
+        
+        # 分类统计 - 处理None和unclassified (derived from the per-classification counts)
+        unclassified_count = classification_stats.get('unclassified', 0)
+        classified_count = sum(classification_stats.values()) - unclassified_count
         
         # 旅行相关分类统计
         travel_stats = {}
@@ -658,13 +696,6 @@ async def get_detailed_email_stats() -> Dict:
             total_travel_emails += count
         
         # 内容提取统计 - 只统计旅行相关邮件的提取状态
-        # 首先获取所有旅行相关邮件的ID列表
-        travel_email_ids_list = [
-            row[0] for row in db.query(Email.email_id).filter(
-                Email.classification.in_(TRAVEL_CATEGORIES)
-            ).all()
-        ]
-        
         # 初始化计数器
         content_extracted_count = 0
         content_failed_count = 0
@@ -679,81 +710,45 @@ async def get_detailed_email_stats() -> Dict:
         booking_no_booking_count = 0
         
         try:
-            # 检查EmailContent表是否有新字段
-            # 先尝试一个简单的查询来测试字段是否存在
-            test_query = db.query(EmailContent).filter(
-                EmailContent.email_id.in_(travel_email_ids_list)
-            ).first()
-            
-            # 如果到这里没有异常，说明基础字段存在，继续统计
-            content_extracted_count = db.query(EmailContent).filter(
-                EmailContent.extraction_status == 'completed',
-                EmailContent.email_id.in_(travel_email_ids_list)
-            ).count()
-            
-            content_failed_count = db.query(EmailContent).filter(
-                EmailContent.extraction_status == 'failed',
-                EmailContent.email_id.in_(travel_email_ids_list)
-            ).count()
+            # Count extraction and booking extraction statuses for travel and
+            # non-travel emails in a single grouped query
+            is_travel = Email.classification.in_(TRAVEL_CATEGORIES)
+            status_rows = db.query(
+                is_travel,
+                EmailContent.extraction_status,
+                EmailContent.booking_extraction_status,
+                func.count(EmailContent.id)
+            ).join(
+                Email, Email.email_id == EmailContent.email_id
+            ).group_by(
+                is_travel,
+                EmailContent.extraction_status,
+                EmailContent.booking_extraction_status
+            ).all()
             
-            content_extracting_count = db.query(EmailContent).filter(
-                EmailContent.extraction_status == 'extracting',
-                EmailContent.email_id.in_(travel_email_ids_list)
-            ).count()
+            extraction_counts = {True: defaultdict(int), False: defaultdict(int)}
+            booking_counts = {True: defaultdict(int), False: defaultdict(int)}
+            for travel, extraction_status, booking_status, count in status_rows:
+                if travel is None:
+                    # Emails without a classification are neither travel nor non-travel
+                    continue
+                extraction_counts[bool(travel)][extraction_status] += count
+                booking_counts[bool(travel)][booking_status] += count
             
+            content_extracted_count = extraction_counts[True]['completed']
+            content_failed_count = extraction_counts[True]['failed']
+            content_extracting_count = extraction_counts[True]['extracting']
             # Count not_required status for non-travel emails
-            non_travel_email_ids_list = [
-                row[0] for row in db.query(Email.email_id).filter(
-                    ~Email.classification.in_(TRAVEL_CATEGORIES)
-                ).all()
-            ]
-            
-            content_not_required_count = db.query(EmailContent).filter(
-                EmailContent.extraction_status == 'not_required',
-                EmailContent.email_id.in_(non_travel_email_ids_list)
-            ).count()
+            content_not_required_count = extraction_counts[False]['not_required']
             
             content_pending_count = total_travel_emails - content_extracted_count - content_failed_count - content_extracting_count
             
-            # 现在尝试booking extraction相关的查询
-            try:
-                booking_completed_count = db.query(EmailContent).filter(
-                    EmailContent.booking_extraction_status == 'completed',
-                    EmailContent.email_id.in_(travel_email_ids_list)
-                ).count()
-                
-                booking_failed_count = db.query(EmailContent).filter(
-                    EmailContent.booking_extraction_status == 'failed',
-                    EmailContent.email_id.in_(travel_email_ids_list)
-                ).count()
-                
-                booking_extracting_count = db.query(EmailContent).filter(
-                    EmailContent.booking_extraction_status == 'extracting',
-                    EmailContent.email_id.in_(travel_email_ids_list)
-                ).count()
-                
-                # 查询no_booking状态的数量
-                booking_no_booking_count = db.query(EmailContent).filter(
-                    EmailContent.booking_extraction_status == 'no_booking',
-                    EmailContent.email_id.in_(travel_email_ids_list)
-                ).count()
-                
-                # 查询not_travel状态的数量
-                booking_not_travel_count = db.query(EmailContent).filter(
-                    EmailContent.booking_extraction_status == 'not_travel',
-                    EmailContent.email_id.in_(non_travel_email_ids_list)
-                ).count()
-                
-                # 真正的pending数量应该直接查询
-                booking_pending_count = db.query(EmailContent).filter(
-                    EmailContent.booking_extraction_status == 'pending',
-                    EmailContent.email_id.in_(travel_email_ids_list)
-                ).count()
-                
-            except Exception as e:
-                # booking extraction字段不存在，所有已提取内容的邮件都标记为待处理
-                booking_pending_count = content_extracted_count
-                print(f"Booking extraction columns not found, marking {content_extracted_count} emails as pending booking extraction")
+            booking_completed_count = booking_counts[True]['completed']
+            booking_failed_count = booking_counts[True]['failed']
+            booking_extracting_count = booking_counts[True]['extracting']
+            booking_no_booking_count = booking_counts[True]['no_booking']
+            booking_not_travel_count = booking_counts[False]['not_travel']
+            booking_pending_count = booking_counts[True]['pending']
                 
         except Exception as e:
             # EmailContent表查询失败，可能表不存在或字段有问题
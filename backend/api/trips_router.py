@@ -4,10 +4,12 @@ Trip Management API Endpoints
 from fastapi import APIRouter, HTTPException, Query
 from typing import Dict, List, Optional
 from datetime import datetime, time, timedelta
-from sqlalchemy import func, extract
+from sqlalchemy import func, extract, case
+from sqlalchemy.orm import selectinload
 from collections import defaultdict
 from backend.database.config import SessionLocal
 from backend.database.models import Trip, TransportSegment, Accommodation, TourActivity, Cruise
+from backend.lib import serialization
 from backend.services.trip_detection_service import TripDetectionService
 from backend.services.email_booking_extraction_service import EmailBookingExtractionService
 
@@ -82,7 +84,7 @@ async def reset_trip_detection() -> Dict:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/")
-async def list_trips(
+def list_trips(
     start_date: Optional[datetime] = Query(None, description="Filter trips starting after this date"),
     end_date: Optional[datetime] = Query(None, description="Filter trips ending before this date")
 ) -> List[Dict]:
@@ -100,26 +102,29 @@ async def list_trips(
         # Order by start date descending
         trips = query.order_by(Trip.start_date.desc()).all()
         
+        # Count bookings and cancellations of every trip with one grouped query per booking table
+        # {trip_id: (booking_count, cancelled_count)} per booking table
+        counts_by_table = []
+        for model in (TransportSegment, Accommodation, TourActivity, Cruise):
+            rows = db.query(
+                model.trip_id,
+                func.count(model.id),
+                func.sum(case((model.status == 'cancelled', 1), else_=0))
+            ).group_by(model.trip_id).all()
+            counts_by_table.append({trip_id: (count, cancelled) for trip_id, count, cancelled in rows})
+        
         # Build trip list with summary info
         trip_list = []
         for trip in trips:
             # Parse cities visited
-            import json
-            cities_visited = json.loads(trip.cities_visited) if trip.cities_visited else []
+            cities_visited = serialization.loads(trip.cities_visited) if trip.cities_visited else []
             
             # Count bookings and calculate status
-            transport_count = db.query(TransportSegment).filter_by(trip_id=trip.id).count()
-            accommodation_count = db.query(Accommodation).filter_by(trip_id=trip.id).count()
-            tour_count = db.query(TourActivity).filter_by(trip_id=trip.id).count()
-            cruise_count = db.query(Cruise).filter_by(trip_id=trip.id).count()
+            trip_counts = [table_counts.get(trip.id, (0, 0)) for table_counts in counts_by_table]
+            transport_count, accommodation_count, tour_count, cruise_count = (count for count, _ in trip_counts)
             
             # Check for cancellations
-            has_cancellations = (
-                db.query(TransportSegment).filter_by(trip_id=trip.id, status='cancelled').count() > 0 or
-                db.query(Accommodation).filter_by(trip_id=trip.id, status='cancelled').count() > 0 or
-                db.query(TourActivity).filter_by(trip_id=trip.id, status='cancelled').count() > 0 or
-                db.query(Cruise).filter_by(trip_id=trip.id, status='cancelled').count() > 0
-            )
+            has_cancellations = any(cancelled > 0 for _, cancelled in trip_counts)
             
             trip_dict = {
                 'id': trip.id,
@@ -149,7 +154,7 @@ async def list_trips(
         db.close()
 
 @router.get("/timeline")
-async def get_timeline(
+def get_timeline(
     start_date: Optional[datetime] = Query(None, description="Filter activities starting after this date"),
     end_date: Optional[datetime] = Query(None, description="Filter activities ending before this date")
 ) -> Dict:
@@ -160,7 +165,8 @@ async def get_timeline(
         
         # First get all trips to create a mapping
         trips_map = {}
-        trips = db.query(Trip).all()
+        # Only the columns shown on the timeline; skips the JSON/text columns
+        trips = db.query(Trip.id, Trip.name, Trip.destination, Trip.start_date, Trip.end_date).all()
         for trip in trips:
             trips_map[trip.id] = {
                 'id': trip.id,
@@ -293,7 +299,7 @@ async def get_timeline(
         db.close()
 
 @router.get("/statistics")
-async def get_travel_statistics(
+def get_travel_statistics(
     year: Optional[int] = Query(None, description="Filter statistics by year")
 ) -> Dict:
     """Get comprehensive travel statistics"""
@@ -336,35 +342,22 @@ async def get_travel_statistics(
         total_trips = trips_query.count()
         total_cost = db.query(func.sum(Trip.total_cost)).scalar() or 0
         
-        # Transport statistics
-        transport_segments = transport_query.all()
-        total_flights = sum(1 for t in transport_segments if t.segment_type == 'flight')
-        total_trains = sum(1 for t in transport_segments if t.segment_type == 'train')
-        total_distance = sum(t.distance_km or 0 for t in transport_segments)
-        flight_distance = sum(t.distance_km or 0 for t in transport_segments if t.segment_type == 'flight')
-        train_distance = sum(t.distance_km or 0 for t in transport_segments if t.segment_type == 'train')
-        
-        # Accommodation statistics
-        accommodations = accommodation_query.all()
-        hotel_nights = sum(
-            (acc.check_out_date - acc.check_in_date).days 
-            for acc in accommodations 
-            if acc.check_out_date and acc.check_in_date
-        )
-        
         # Countries and cities visited
         countries = set()
         cities = set()
         
-        # From accommodations
-        for acc in accommodations:
-            if acc.country:
-                countries.add(acc.country)
-            if acc.city:
-                cities.add(acc.city)
-        
-        # From transport segments
+        # Transport statistics, breakdown by type and cities in a single pass
+        transport_segments = transport_query.all()
+        total_distance = 0
+        transport_breakdown = defaultdict(lambda: {'count': 0, 'distance': 0})
         for seg in transport_segments:
+            distance = seg.distance_km or 0
+            total_distance += distance
+            
+            seg_type = seg.segment_type or 'other'
+            transport_breakdown[seg_type]['count'] += 1
+            transport_breakdown[seg_type]['distance'] += distance
+            
             # Parse locations to extract cities/countries
             if seg.departure_location:
                 parts = seg.departure_location.split(',')
@@ -375,16 +368,39 @@ async def get_travel_statistics(
                 if len(parts) > 1:
                     cities.add(parts[0].strip())
         
-        # From trips
+        flight_stats = transport_breakdown.get('flight', {'count': 0, 'distance': 0})
+        train_stats = transport_breakdown.get('train', {'count': 0, 'distance': 0})
+        total_flights = flight_stats['count']
+        total_trains = train_stats['count']
+        flight_distance = flight_stats['distance']
+        train_distance = train_stats['distance']
+        
+        # Accommodation statistics
+        accommodations = accommodation_query.all()
+        hotel_nights = 0
+        for acc in accommodations:
+            if acc.check_out_date and acc.check_in_date:
+                hotel_nights += (acc.check_out_date - acc.check_in_date).days
+            if acc.country:
+                countries.add(acc.country)
+            if acc.city:
+                cities.add(acc.city)
+        
+        # Visited cities, destinations and monthly distribution from trips in a single pass
+        destination_count = defaultdict(int)
+        monthly_trips = defaultdict(int)
         trips = trips_query.all()
         for trip in trips:
             if trip.cities_visited:
-                import json
                 try:
-                    visited = json.loads(trip.cities_visited)
-                    cities.update(visited)
+                    cities.update(serialization.loads(trip.cities_visited))
                 except:
                     pass
+            if trip.destination:
+                destination_count[trip.destination] += 1
+            if trip.start_date:
+                month_key = trip.start_date.strftime('%Y-%m')
+                monthly_trips[month_key] += 1
         
         # Get available years for filter
         years_with_trips = db.query(
@@ -392,32 +408,12 @@ async def get_travel_statistics(
         ).distinct().order_by('year').all()
         available_years = [y.year for y in years_with_trips if y.year]
         
-        # Transport breakdown by type
-        transport_breakdown = defaultdict(lambda: {'count': 0, 'distance': 0})
-        for seg in transport_segments:
-            seg_type = seg.segment_type or 'other'
-            transport_breakdown[seg_type]['count'] += 1
-            transport_breakdown[seg_type]['distance'] += seg.distance_km or 0
-        
-        # Top destinations (by frequency)
-        destination_count = defaultdict(int)
-        for trip in trips:
-            if trip.destination:
-                destination_count[trip.destination] += 1
-        
         top_destinations = sorted(
             destination_count.items(), 
             key=lambda x: x[1], 
             reverse=True
         )[:10]
         
-        # Monthly distribution
-        monthly_trips = defaultdict(int)
-        for trip in trips:
-            if trip.start_date:
-                month_key = trip.start_date.strftime('%Y-%m')
-                monthly_trips[month_key] += 1
-        
         # Build response
         statistics = {
             'summary': {
@@ -455,7 +451,7 @@ async def get_travel_statistics(
         db.close()
 
 @router.get("/statistics/flights")
-async def get_flight_statistics_detail(
+def get_flight_statistics_detail(
     year: Optional[int] = Query(None, description="Filter by year")
 ) -> Dict:
     """Get detailed flight statistics"""
@@ -546,7 +542,7 @@ async def get_flight_statistics_detail(
         db.close()
 
 @router.get("/statistics/hotels")
-async def get_hotel_statistics_detail(
+def get_hotel_statistics_detail(
     year: Optional[int] = Query(None, description="Filter by year")
 ) -> Dict:
     """Get detailed hotel statistics"""
@@ -652,7 +648,7 @@ async def get_hotel_statistics_detail(
         db.close()
 
 @router.get("/statistics/costs")
-async def get_cost_statistics_detail(
+def get_cost_statistics_detail(
     year: Optional[int] = Query(None, description="Filter by year")
 ) -> Dict:
     """Get detailed cost breakdown statistics"""
@@ -753,7 +749,7 @@ async def get_cost_statistics_detail(
         most_expensive = sorted(all_items, key=lambda x: x['cost'], reverse=True)[:20]
         
         # Cost by destination (from trips)
-        trips = db.query(Trip).all()
+        trips = db.query(Trip.destination, Trip.total_cost, Trip.start_date).all()
         destination_costs = defaultdict(float)
         for trip in trips:
             if trip.destination and trip.total_cost:
@@ -796,7 +792,7 @@ async def get_cost_statistics_detail(
         db.close()
 
 @router.get("/{trip_id}")
-async def get_trip_details(trip_id: int) -> Dict:
+def get_trip_details(trip_id: int) -> Dict:
     """Get detailed trip information including all bookings"""
     db = SessionLocal()
     try:
@@ -809,9 +805,9 @@ async def get_trip_details(trip_id: int) -> Dict:
         import json
         cities_visited = json.loads(trip.cities_visited) if trip.cities_visited else []
         
-        # Get all related bookings
+        # Get all related bookings (related emails are loaded per booking type in one extra query)
         transport_segments = []
-        for segment in db.query(TransportSegment).filter_by(trip_id=trip_id).all():
+        for segment in db.query(TransportSegment).options(selectinload(TransportSegment.emails)).filter_by(trip_id=trip_id).all():
             # Get related emails
             email_ids = [link.email_id for link in segment.emails]
             
@@ -836,7 +832,7 @@ async def get_trip_details(trip_id: int) -> Dict:
             })
         
         accommodations = []
-        for accommodation in db.query(Accommodation).filter_by(trip_id=trip_id).all():
+        for accommodation in db.query(Accommodation).options(selectinload(Accommodation.emails)).filter_by(trip_id=trip_id).all():
             email_ids = [link.email_id for link in accommodation.emails]
             
             accommodations.append({
@@ -856,7 +852,7 @@ async def get_trip_details(trip_id: int) -> Dict:
             })
         
         tour_activities = []
-        for tour in db.query(TourActivity).filter_by(trip_id=trip_id).all():
+        for tour in db.query(TourActivity).options(selectinload(TourActivity.emails)).filter_by(trip_id=trip_id).all():
             email_ids = [link.email_id for link in tour.emails]
             
             tour_activities.append({
@@ -876,7 +872,7 @@ async def get_trip_details(trip_id: int) -> Dict:
             })
         
         cruises = []
-        for cruise in db.query(Cruise).filter_by(trip_id=trip_id).all():
+        for cruise in db.query(Cruise).options(selectinload(Cruise.emails)).filter_by(trip_id=trip_id).all():
             email_ids = [link.email_id for link in cruise.emails]
             itinerary = json.loads(cruise.itinerary) if cruise.itinerary else []
             
@@ -937,7 +933,7 @@ async def get_trip_details(trip_id: int) -> Dict:
         db.close()
 
 @router.put("/{trip_id}")
-async def update_trip(trip_id: int, trip_data: dict) -> Dict:
+def update_trip(trip_id: int, trip_data: dict) -> Dict:
     """Update trip information (manual editing)"""
     db = SessionLocal()
     try:
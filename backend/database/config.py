@@ -45,6 +45,10 @@ def get_db():
 def create_tables():
     """创建所有表"""
     Base.metadata.create_all(bind=engine)
+    # create_all skips existing tables, so also add indexes declared after a table was created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 def drop_tables():
     """删除所有表（慎用）"""
@@ -6,6 +6,7 @@ from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from backend.database.config import Base
+from backend.constants import TRAVEL_CATEGORIES_SET
 
 class Email(Base):
     """邮件表"""
@@ -39,6 +40,8 @@ class Email(Base):
     __table_args__ = (
         Index('idx_emails_date_classified', 'timestamp', 'is_classified'),
         Index('idx_emails_classification', 'classification'),
+        # 只包含尚未回填标签的邮件（部分索引）
+        Index('idx_emails_labels_missing', 'id', sqlite_where=labels.is_(None)),
     )
     
     def __repr__(self):
@@ -46,12 +49,7 @@ class Email(Base):
     
     def is_travel_related(self) -> bool:
         """判断是否为旅行相关邮件"""
-        travel_categories = {
-            'flight', 'hotel', 'car_rental', 'train', 'cruise', 
-            'tour', 'travel_insurance', 'flight_change', 
-            'hotel_change', 'other_travel'
-        }
-        return self.classification in travel_categories
+        return self.classification in TRAVEL_CATEGORIES_SET
 
 class Trip(Base):
     """旅行记录表（未来扩展用）"""
@@ -160,6 +158,8 @@ class EmailContent(Base):
         Index('idx_email_content_status', 'extraction_status'),
         Index('idx_email_content_booking_status', 'booking_extraction_status'),
         Index('idx_email_content_trip_status', 'trip_detection_status'),
+        # Pipeline stage filters combine these statuses (e.g. trip detection candidates)
+        Index('idx_email_content_pipeline_status', 'booking_extraction_status', 'extraction_status', 'trip_detection_status'),
     )
     
     def __repr__(self):
@@ -342,6 +342,11 @@ class EmailTransportSegment(Base):
     email_id = Column(String(255), ForeignKey('emails.email_id'), primary_key=True)
     transport_segment_id = Column(Integer, ForeignKey('transport_segments.id'), primary_key=True)
     created_at = Column(DateTime, default=func.now())
+    
+    # 索引
+    __table_args__ = (
+        Index('idx_email_transport_segment_segment_id', 'transport_segment_id'),
+    )
 
 class EmailAccommodation(Base):
     """邮件与住宿关联表"""
@@ -350,6 +355,11 @@ class EmailAccommodation(Base):
     email_id = Column(String(255), ForeignKey('emails.email_id'), primary_key=True)
     accommodation_id = Column(Integer, ForeignKey('accommodations.id'), primary_key=True)
     created_at = Column(DateTime, default=func.now())
+    
+    # 索引
+    __table_args__ = (
+        Index('idx_email_accommodation_accommodation_id', 'accommodation_id'),
+    )
 
 class EmailTourActivity(Base):
     """邮件与旅游活动关联表"""
@@ -358,6 +368,11 @@ class EmailTourActivity(Base):
     email_id = Column(String(255), ForeignKey('emails.email_id'), primary_key=True)
     tour_activity_id = Column(Integer, ForeignKey('tour_activities.id'), primary_key=True)
     created_at = Column(DateTime, default=func.now())
+    
+    # 索引
+    __table_args__ = (
+        Index('idx_email_tour_activity_activity_id', 'tour_activity_id'),
+    )
 
 class EmailCruise(Base):
     """邮件与邮轮关联表"""
@@ -366,6 +381,11 @@ class EmailCruise(Base):
     email_id = Column(String(255), ForeignKey('emails.email_id'), primary_key=True)
     cruise_id = Column(Integer, ForeignKey('cruises.id'), primary_key=True)
     created_at = Column(DateTime, default=func.now())
+    
+    # 索引
+    __table_args__ = (
+        Index('idx_email_cruise_cruise_id', 'cruise_id'),
+    )
 
 # 添加Trip表的关系
 Trip.transport_segments = relationship("TransportSegment", back_populates="trip")
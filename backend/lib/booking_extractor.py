@@ -5,6 +5,7 @@ import json
 import logging
 from typing import Dict, Optional
 from backend.lib.ai.ai_provider_interface import AIProviderInterface
+from backend.lib import serialization
 
 logger = logging.getLogger(__name__)
 
@@ -301,7 +302,7 @@ IMPORTANT: Return ONLY the JSON object. Do NOT include any thinking process, exp
                 if end > start:
                     response_text = response_text[start:end]
             
-            booking_info = json.loads(response_text.strip())
+            booking_info = serialization.loads(response_text.strip())
             return booking_info
             
         except Exception as e:
@@ -6,6 +6,8 @@ import os
 import sys
 from typing import List, Dict, Optional, Set
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_
 
@@ -18,6 +20,15 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=4096)
+def _parse_date_header(date_str: str) -> Optional[datetime]:
+    """Parse an RFC 2822 Date header to a naive datetime; memoized because bulk senders repeat dates"""
+    dt = parsedate_to_datetime(date_str)
+    # 移除时区信息以避免SQLite兼容性问题
+    return dt.replace(tzinfo=None) if dt else None
+
+
 class EmailCacheDB:
     """基于SQLite数据库的邮件缓存管理器"""
     
@@ -46,8 +57,8 @@ class EmailCacheDB:
         """
         db = self._get_session()
         try:
-            email_ids = db.query(Email.email_id).all()
-            return {email_id[0] for email_id in email_ids}
+            # 分批读取，不先生成完整的结果列表
+            return {email_id[0] for email_id in db.query(Email.email_id).yield_per(1000)}
         except Exception as e:
             logger.error(f"Failed to get cached IDs: {e}")
             return set()
@@ -67,15 +78,19 @@ class EmailCacheDB:
         
         db = self._get_session()
         try:
-            # 获取已缓存的 ID
-            cached_ids = self.get_cached_ids()
+            # 只查询本批邮件中已缓存的 ID，不加载整张表的 ID
+            batch_ids = {email.get('email_id') for email in emails}
+            cached_ids = {
+                row[0] for row in db.query(Email.email_id).filter(Email.email_id.in_(batch_ids))
+            }
             
             # 过滤出新邮件并转换为数据库模型
             new_emails = []
             for email in emails:
                 if email.get('email_id') not in cached_ids:
+                    cached_ids.add(email.get('email_id'))
                     # 解析邮件日期
-                    timestamp = self._parse_email_date(email.get('date', ''))
+                    timestamp = self.parse_email_date(email.get('date', ''))
                     
                     email_model = Email(
                         email_id=email.get('email_id', ''),
@@ -118,7 +133,16 @@ class EmailCacheDB:
         """
         db = self._get_session()
         try:
-            query = db.query(Email)
+            # 只查询返回的字段，不加载邮件正文等大字段
+            query = db.query(
+                Email.email_id,
+                Email.subject,
+                Email.sender,
+                Email.date,
+                Email.timestamp,
+                Email.is_classified,
+                Email.classification
+            )
             
             # 应用分类过滤
             if filter_classified is not None:
@@ -148,10 +172,9 @@ class EmailCacheDB:
             if limit:
                 query = query.limit(limit)
             
-            # 执行查询并转换为字典格式（与CSV版本兼容）
-            emails = []
-            for email in query.all():
-                email_dict = {
+            # 逐行读取结果并转换为字典格式（与CSV版本兼容）
+            return [
+                {
                     'email_id': email.email_id,
                     'subject': email.subject or '',
                     'from': email.sender or '',  # 注意：这里转换回'from'以保持兼容性
@@ -160,9 +183,8 @@ class EmailCacheDB:
                     'is_classified': 'true' if email.is_classified else 'false',
                     'classification': email.classification or ''
                 }
-                emails.append(email_dict)
-            
-            return emails
+                for email in query
+            ]
             
         except Exception as e:
             logger.error(f"Failed to get emails: {e}")
@@ -313,17 +335,14 @@ class EmailCacheDB:
                 'classifications': {}
             }
     
-    def _parse_email_date(self, date_str: str) -> Optional[datetime]:
+    def parse_email_date(self, date_str: str) -> Optional[datetime]:
         """解析邮件日期字符串为datetime对象"""
         if not date_str:
             return None
         
         try:
-            # 尝试解析 Gmail 日期格式
-            from email.utils import parsedate_to_datetime
-            dt = parsedate_to_datetime(date_str)
-            # 移除时区信息以避免SQLite兼容性问题
-            return dt.replace(tzinfo=None) if dt else None
+            # 尝试解析 Gmail 日期格式（解析失败不会被缓存，每次都会记录警告）
+            return _parse_date_header(date_str)
         except Exception as e:
             logger.warning(f"Failed to parse date '{date_str}': {e}")
             return None
@@ -2,10 +2,10 @@
 邮件分类库
 使用 AI 对邮件进行分类
 """
-import json
 import logging
 from typing import List, Dict, Optional
 from backend.lib.ai.ai_provider_interface import AIProviderInterface
+from backend.lib import serialization
 from backend.constants import TRAVEL_CATEGORIES_SET, NON_TRAVEL_CATEGORIES_SET
 
 logger = logging.getLogger(__name__)
@@ -153,7 +153,7 @@ REMEMBER: Your response must start with [ and contain only valid JSON."""
                     response_text = response_text[start:end].strip()
             
             # 解析 JSON
-            classifications = json.loads(response_text)
+            classifications = serialization.loads(response_text)
             
             # 构建结果
             results = []
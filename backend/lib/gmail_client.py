@@ -6,10 +6,14 @@ import os
 import json
 import pickle
 import base64
+import time
 import logging
+import concurrent.futures
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
+import httplib2
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
@@ -23,6 +27,18 @@ class GmailClient:
     # Gmail API 访问范围
     SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
+    # 批量请求中遇到限流或临时错误时重试的状态码和次数
+    RETRYABLE_STATUS = (429, 500, 503)
+    MAX_BATCH_RETRIES = 5
+    # Gmail 的按用户限流以 403 返回，只能通过错误原因区分
+    RATE_LIMIT_REASONS = frozenset({'rateLimitExceeded', 'userRateLimitExceeded'})
+
+    # 批量获取邮件头时只请求这些字段（与 _parse_message_headers 保留的字段一致）
+    METADATA_HEADERS = ['Subject', 'From', 'To', 'Date']
+
+    # 没有参考价值的系统标签，转换标签名称时跳过
+    SKIPPED_SYSTEM_LABELS = frozenset({'INBOX', 'SENT', 'UNREAD', 'IMPORTANT'})
+
     def __init__(self, credentials_path: str, token_path: str):
         """
         初始化 Gmail 客户端
@@ -34,6 +50,7 @@ class GmailClient:
         self.credentials_path = credentials_path
         self.token_path = token_path
         self.service = None
+        self.credentials = None
         self.authenticated = False
         self.auth_error = None
         self.label_cache = {}  # Cache for label ID to name mapping
@@ -93,6 +110,7 @@ class GmailClient:
                         pickle.dump(creds, token)
 
             self.service = build('gmail', 'v1', credentials=creds)
+            self.credentials = creds
             self.authenticated = True
             self.auth_error = None
             logger.info("Gmail authentication successful")
@@ -196,30 +214,44 @@ class GmailClient:
         Returns:
             所有匹配的邮件 ID 和线程 ID 列表
         """
+        results = []
+        for messages in self.iter_message_pages(query):
+            results.extend(messages)
+        return results
+    
+    def iter_message_pages(self, query: str = ''):
+        """
+        逐页获取符合查询条件的邮件，调用方处理当前页时下一页已在后台请求
+
+        Args:
+            query: Gmail 搜索查询语句
+
+        Yields:
+            每一页的邮件 ID 和线程 ID 列表
+        """
         self._require_authentication()
-        try:
-            results = []
-            page_token = None
-            
-            while True:
-                response = self.service.users().messages().list(
-                    userId='me',
-                    q=query,
-                    pageToken=page_token,
-                    maxResults=500  # Gmail API 单次调用最大值
-                ).execute()
-                
-                messages = response.get('messages', [])
-                results.extend(messages)
+        # 预取在另一个线程中执行，需要独立的 HTTP 连接
+        http = self._new_http()
+        
+        def list_page(page_token: Optional[str]) -> Dict[str, Any]:
+            return self.service.users().messages().list(
+                userId='me',
+                q=query,
+                pageToken=page_token,
+                maxResults=500  # Gmail API 单次调用最大值
+            ).execute(http=http)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            list_future = executor.submit(list_page, None)
+            while list_future is not None:
+                try:
+                    response = list_future.result()
+                except HttpError as error:
+                    raise Exception(f"Gmail API 错误: {error}")
                 
                 page_token = response.get('nextPageToken')
-                if not page_token:
-                    break
-            
-            return results
-            
-        except HttpError as error:
-            raise Exception(f"Gmail API 错误: {error}")
+                list_future = executor.submit(list_page, page_token) if page_token else None
+                yield response.get('messages', [])
     
     def get_message(self, message_id: str, format: str = 'full') -> Dict[str, Any]:
         """
@@ -255,6 +287,10 @@ class GmailClient:
             包含 Subject, From, Date, label_names 等的字典
         """
         message = self.get_message(message_id, format='metadata')
+        return self._parse_message_headers(message)
+    
+    def _parse_message_headers(self, message: Dict[str, Any]) -> Dict[str, str]:
+        """从 metadata 格式的邮件中提取头信息和标签名"""
         headers = {}
 
         for header in message.get('payload', {}).get('headers', []):
@@ -265,15 +301,15 @@ class GmailClient:
         # Convert label IDs to label names
         label_ids = message.get('labelIds', [])
         if label_ids:
-            # Map label IDs to names, filtering out system labels that are not useful
-            label_names = []
-            for label_id in label_ids:
-                # Skip common system labels that don't add value
-                if label_id in ['INBOX', 'SENT', 'UNREAD', 'IMPORTANT']:
-                    continue
-                # Get label name from cache, fallback to ID if not found
-                label_name = self.label_cache.get(label_id, label_id)
-                label_names.append(label_name)
+            # Map label IDs to names (fallback to ID if not in cache), skipping
+            # common system labels that don't add value
+            label_cache = self.label_cache
+            skipped = self.SKIPPED_SYSTEM_LABELS
+            label_names = [
+                label_cache.get(label_id, label_id)
+                for label_id in label_ids
+                if label_id not in skipped
+            ]
 
             if label_names:
                 headers['label_names'] = label_names
@@ -385,42 +421,131 @@ class GmailClient:
         start_date = end_date - timedelta(days=days_back)
         return self.search_emails_by_date_range(start_date, end_date)
     
-    def batch_get_headers(self, message_ids: List[str], batch_size: int = 100) -> List[Dict[str, str]]:
+    def iter_emails_by_date_range_pages(self, start_date: datetime, end_date: datetime):
         """
-        批量获取邮件头信息
+        逐页搜索指定日期范围内的邮件（下一页预取）
         
         Args:
-            message_ids: 邮件 ID 列表
-            batch_size: 批处理大小
+            start_date: 开始日期 (inclusive)
+            end_date: 结束日期 (inclusive)
             
+        Yields:
+            每一页的邮件 ID 和线程 ID 列表
+        """
+        after_date = start_date.strftime('%Y/%m/%d')
+        before_date = (end_date + timedelta(days=1)).strftime('%Y/%m/%d')
+        query = f'after:{after_date} before:{before_date}'
+        
+        logger.info(f"Searching emails with query: {query}")
+        return self.iter_message_pages(query)
+    
+    def _new_http(self) -> AuthorizedHttp:
+        """为工作线程创建独立的 HTTP 连接（httplib2 不是线程安全的）"""
+        return AuthorizedHttp(self.credentials, http=httplib2.Http())
+    
+    def _is_retryable_error(self, error: HttpError) -> bool:
+        """限流（429 或限流原因的 403）和临时服务端错误可以重试"""
+        status = error.resp.status
+        if status in self.RETRYABLE_STATUS:
+            return True
+        if status == 403:
+            # 从响应体的 error.errors[].reason 判断是否为限流
+            try:
+                errors = json.loads(error.content)['error'].get('errors', [])
+            except (ValueError, KeyError, TypeError, AttributeError):
+                return False
+            return any(
+                isinstance(item, dict) and item.get('reason') in self.RATE_LIMIT_REASONS
+                for item in errors
+            )
+        return False
+    
+    def _execute_headers_batch(self, message_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        用一个批量请求获取邮件 metadata，限流或临时错误时指数退避重试
+
+        Args:
+            message_ids: 邮件 ID 列表（不超过 100 个）
+
         Returns:
-            邮件头信息列表
+            邮件 ID 到 Gmail 响应的映射，获取失败的邮件不在其中
         """
-        headers_list = []
+        http = self._new_http()
+        responses = {}
+        pending = list(message_ids)
         
-        for i in range(0, len(message_ids), batch_size):
-            batch = message_ids[i:i + batch_size]
-            batch_request = self.service.new_batch_http_request()
+        for attempt in range(self.MAX_BATCH_RETRIES):
+            if attempt:
+                delay = min(60, 2 ** attempt)
+                logger.warning(f"{len(pending)} 封邮件被限流，{delay} 秒后重试 (第 {attempt} 次)")
+                time.sleep(delay)
             
-            for msg_id in batch:
+            retry = []
+            
+            def collect(request_id, response, exception):
+                if exception is None:
+                    responses[request_id] = response
+                elif isinstance(exception, HttpError) and self._is_retryable_error(exception):
+                    retry.append(request_id)
+                else:
+                    logger.error(f"获取邮件 {request_id} 失败: {exception}")
+            
+            batch_request = self.service.new_batch_http_request(callback=collect)
+            for msg_id in pending:
                 batch_request.add(
                     self.service.users().messages().get(
                         userId='me',
                         id=msg_id,
                         format='metadata',
-                        metadataHeaders=['Subject', 'From', 'Date']
-                    )
+                        metadataHeaders=self.METADATA_HEADERS
+                    ),
+                    request_id=msg_id
                 )
             
-            batch_request.execute()
+            try:
+                batch_request.execute(http=http)
+            except HttpError as error:
+                if not self._is_retryable_error(error):
+                    raise
+                # 整个批量请求被拒绝，重试所有尚未取回的邮件
+                retry = [msg_id for msg_id in pending if msg_id not in responses]
             
-            # 处理批量响应
+            if not retry:
+                break
+            pending = retry
+        else:
+            logger.error(f"重试 {self.MAX_BATCH_RETRIES} 次后仍有 {len(pending)} 封邮件获取失败")
+        
+        return responses
+    
+    def batch_get_headers(self, message_ids: List[str], batch_size: int = 100,
+                          max_workers: int = 4) -> List[Dict[str, str]]:
+        """
+        批量获取邮件头信息
+
+        Args:
+            message_ids: 邮件 ID 列表
+            batch_size: 批处理大小（Gmail 单个批量请求最多 100 个）
+            max_workers: 同时执行的批量请求数
+
+        Returns:
+            邮件头信息列表，顺序与 message_ids 一致
+        """
+        self._require_authentication()
+        batches = [message_ids[i:i + batch_size] for i in range(0, len(message_ids), batch_size)]
+        if not batches:
+            return []
+        
+        # 多个批量请求并发执行，每个请求一次 HTTP 调用取回整批 metadata
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            batch_responses = list(executor.map(self._execute_headers_batch, batches))
+        
+        headers_list = []
+        for batch, responses in zip(batches, batch_responses):
             for msg_id in batch:
-                try:
-                    headers = self.get_message_headers(msg_id)
+                if msg_id in responses:
+                    headers = self._parse_message_headers(responses[msg_id])
                     headers['email_id'] = msg_id
                     headers_list.append(headers)
-                except Exception as e:
-                    print(f"获取邮件 {msg_id} 失败: {e}")
         
         return headers_list
\ No newline at end of file
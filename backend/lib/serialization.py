@@ -0,0 +1,34 @@
+"""
+JSON serialization helpers - use orjson when installed, stdlib json otherwise
+"""
+import json
+import logging
+from typing import Any, Union
+
+logger = logging.getLogger(__name__)
+
+# Try to import orjson for faster JSON parsing and encoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.debug("orjson not available, using stdlib json")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document, preferring orjson"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # stdlib json accepts a few non-standard inputs (e.g. NaN) that orjson rejects
+            pass
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize an object to a compact JSON string, preferring orjson"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
@@ -3,12 +3,19 @@ Core Trip Detection Logic - Pure business logic without database dependencies
 """
 import json
 import logging
+import re
 from datetime import datetime
 from typing import List, Dict, Optional
+from backend.lib import serialization
 from backend.lib.ai.ai_provider_interface import AIProviderInterface
 
 logger = logging.getLogger(__name__)
 
+# Shared decoder for pulling the JSON object out of AI responses
+_JSON_DECODER = json.JSONDecoder()
+# Trailing comma before a closing brace or bracket, e.g. '[1, 2, ]'
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+
 # Setup dedicated AI interaction logger
 ai_logger = logging.getLogger('ai_interaction')
 ai_logger.setLevel(logging.INFO)
@@ -278,7 +285,7 @@ class TripDetector:
             labels_json = email.get('labels')
             if labels_json:
                 try:
-                    labels = json.loads(labels_json) if isinstance(labels_json, str) else labels_json
+                    labels = serialization.loads(labels_json) if isinstance(labels_json, str) else labels_json
                 except:
                     labels = []
             labels_text = ', '.join(labels) if labels else 'None'
@@ -529,21 +536,25 @@ FINAL REMINDER: Output ONLY valid JSON starting with {{ and ending with }}. Do N
             # Try to find JSON object directly in the text
             # Look for the start of the JSON object
             json_start = response_text.find('{')
+            result = None
             if json_start >= 0:
-                # Extract from the first '{' to the last '}'
-                json_end = response_text.rfind('}')
-                if json_end > json_start:
-                    response_text = response_text[json_start:json_end + 1]
-            
-            # Try to clean common JSON issues
-            cleaned_text = response_text.strip()
-            
-            # Remove trailing commas before closing braces/brackets
-            import re
-            cleaned_text = re.sub(r',\s*}', '}', cleaned_text)
-            cleaned_text = re.sub(r',\s*]', ']', cleaned_text)
-            
-            result = json.loads(cleaned_text)
+                try:
+                    # Decode the object in place; raw_decode ignores any text after it
+                    result, _ = _JSON_DECODER.raw_decode(response_text, json_start)
+                except json.JSONDecodeError:
+                    # Extract from the first '{' to the last '}' and clean it up below
+                    json_end = response_text.rfind('}')
+                    if json_end > json_start:
+                        response_text = response_text[json_start:json_end + 1]
+            
+            if result is None:
+                # Try to clean common JSON issues
+                cleaned_text = response_text.strip()
+                
+                # Remove trailing commas before closing braces/brackets
+                cleaned_text = _TRAILING_COMMA_RE.sub(r'\1', cleaned_text)
+                
+                result = json.loads(cleaned_text)
             trips = result.get('trips', [])
             
             # Store safe metadata from AI analysis (avoid circular reference)
@@ -563,12 +574,13 @@ FINAL REMINDER: Output ONLY valid JSON starting with {{ and ending with }}. Do N
         except json.JSONDecodeError as e:
             logger.error(f"JSON parsing error at line {e.lineno}, column {e.colno}: {e.msg}")
             # Try to show the problematic part of the response
-            lines = response_text.split('\n')
-            if 0 <= e.lineno - 1 < len(lines):
-                error_line = lines[e.lineno - 1]
-                logger.error(f"Problematic line: {error_line}")
-                if e.colno > 0:
-                    logger.error(f"Error position: {' ' * (e.colno - 1)}^")
+            # e.doc is the string that was decoded; slice the failing line out by offset
+            line_start = e.doc.rfind('\n', 0, e.pos) + 1
+            line_end = e.doc.find('\n', e.pos)
+            error_line = e.doc[line_start:line_end if line_end != -1 else len(e.doc)]
+            logger.error(f"Problematic line: {error_line}")
+            if e.colno > 0:
+                logger.error(f"Error position: {' ' * (e.colno - 1)}^")
             
             # Log a larger portion of the response for debugging
             logger.error(f"Response excerpt (chars {max(0, e.pos-200)} to {min(len(response_text), e.pos+200)}): ...{response_text[max(0, e.pos-200):min(len(response_text), e.pos+200)]}...")
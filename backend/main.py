@@ -45,12 +45,19 @@ app.include_router(content_router, prefix="/api/content", tags=["Email Content"]
 app.include_router(trips_router, prefix="/api/trips", tags=["Trip Management"])
 app.include_router(pipeline_router, prefix="/api/pipeline", tags=["Pipeline Management"])
 
+# index.html is served from memory and only re-read when the file changes
+_frontend_cache = {'mtime': None, 'content': None}
+
 @app.get("/", response_class=HTMLResponse)
 async def serve_frontend():
     """Serve the main frontend application"""
     frontend_file = frontend_path / "index.html"
     if frontend_file.exists():
-        return HTMLResponse(content=frontend_file.read_text(), status_code=200)
+        mtime = frontend_file.stat().st_mtime
+        if _frontend_cache['mtime'] != mtime:
+            _frontend_cache['content'] = frontend_file.read_bytes()
+            _frontend_cache['mtime'] = mtime
+        return HTMLResponse(content=_frontend_cache['content'], status_code=200)
     else:
         return HTMLResponse(content="<h1>Frontend not found</h1>", status_code=404)
 
@@ -3,13 +3,68 @@ BookingInfo domain model with business logic
 """
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 from enum import Enum
 import json
 import logging
+import re
+
+from backend.lib import serialization
 
 logger = logging.getLogger(__name__)
 
+# Zurich area locations, compiled once into a single case-insensitive matcher
+ZURICH_AREA_LOCATIONS = (
+    'zurich', 'zürich', 'zuerich', 'winterthur', 'uster',
+    'dübendorf', 'dietikon', 'wetzikon', 'kloten', 'opfikon',
+    'wallisellen', 'bülach', 'regensdorf', 'schlieren',
+    'zurich airport', 'zürich flughafen', 'zrh'
+)
+_ZURICH_AREA_RE = re.compile(
+    '|'.join(re.escape(area) for area in ZURICH_AREA_LOCATIONS),
+    re.IGNORECASE
+)
+
+# Fields each segment needs for a booking to be complete enough for trip detection
+CAR_SEGMENT_TYPES = frozenset({'car', 'car_rental'})
+CAR_REQUIRED_FIELDS = ('departure_location', 'departure_datetime')
+TRANSPORT_REQUIRED_FIELDS = ('departure_location', 'arrival_location', 'departure_datetime', 'arrival_datetime')
+ACCOMMODATION_REQUIRED_FIELDS = ('property_name', 'check_in_date', 'check_out_date')
+ACTIVITY_REQUIRED_FIELDS = ('activity_name', 'start_datetime')
+CRUISE_REQUIRED_FIELDS = ('cruise_line', 'departure_datetime', 'arrival_datetime')
+
+# Non-transport segment collections and their required fields
+SEGMENT_REQUIRED_FIELDS = (
+    ('accommodations', ACCOMMODATION_REQUIRED_FIELDS),
+    ('activities', ACTIVITY_REQUIRED_FIELDS),
+    ('cruises', CRUISE_REQUIRED_FIELDS),
+)
+
+
+def _compile_required_fields(fields: tuple) -> Callable[[Dict[str, Any]], bool]:
+    """Build a predicate that checks a segment dict has truthy values for all fields"""
+    def has_required_fields(segment: Dict[str, Any]) -> bool:
+        get = segment.get
+        for field in fields:
+            if not get(field):
+                return False
+        return True
+    return has_required_fields
+
+
+# Completeness checks compiled once at import: transport by segment type, the rest by collection
+_TRANSPORT_COMPLETE = _compile_required_fields(TRANSPORT_REQUIRED_FIELDS)
+_TRANSPORT_COMPLETE_BY_TYPE = dict.fromkeys(CAR_SEGMENT_TYPES, _compile_required_fields(CAR_REQUIRED_FIELDS))
+_SEGMENT_COMPLETE_CHECKS = tuple(
+    (attr, _compile_required_fields(fields)) for attr, fields in SEGMENT_REQUIRED_FIELDS
+)
+
+TEST_BOOKING_INDICATORS = ('test', 'demo', 'sample', 'example')
+_TEST_BOOKING_RE = re.compile(
+    '|'.join(re.escape(indicator) for indicator in TEST_BOOKING_INDICATORS),
+    re.IGNORECASE
+)
+
 
 class BookingType(str, Enum):
     FLIGHT = "flight"
@@ -106,6 +161,49 @@ class BookingInfo(BaseModel):
         if not self.is_booking():
             return False
         
+        transport_complete, _ = self._scan_transport_segments()
+        return self._is_complete(transport_complete)
+    
+    def is_zurich_local_trip(self) -> bool:
+        """
+        Check if this is a local trip within Zurich area.
+        Migrated from _is_zurich_local_trip in trip_detection_service.py
+        """
+        if not self.is_booking():
+            return False
+        
+        _, has_local_segment = self._scan_transport_segments()
+        return self._is_zurich_local_trip(has_local_segment)
+    
+    def _scan_transport_segments(self) -> tuple[bool, bool]:
+        """
+        Walk the transport segments once for both preflight checks.
+        Returns (all_segments_complete, has_zurich_local_segment)
+        """
+        all_complete = True
+        has_local_segment = False
+        
+        for segment in self.transport_segments:
+            if all_complete:
+                segment_type = (segment.get('segment_type') or '').lower()
+                
+                # For car rentals, we only strictly require pick-up info
+                # Drop-off info might be missing in some confirmation emails
+                # For flights, trains, etc., we need both departure and arrival
+                is_complete = _TRANSPORT_COMPLETE_BY_TYPE.get(segment_type, _TRANSPORT_COMPLETE)
+                all_complete = is_complete(segment)
+            
+            # Check if both locations are in Zurich area
+            if not has_local_segment:
+                has_local_segment = bool(
+                    _ZURICH_AREA_RE.search(segment.get('departure_location') or '') and
+                    _ZURICH_AREA_RE.search(segment.get('arrival_location') or '')
+                )
+        
+        return all_complete, has_local_segment
+    
+    def _is_complete(self, transport_complete: bool) -> bool:
+        """Completeness check given the result of the transport segment scan"""
         # Must have at least one booking segment
         has_segments = bool(
             self.transport_segments or 
@@ -117,89 +215,26 @@ class BookingInfo(BaseModel):
             return False
         
         # Check transport segments have required fields
-        for segment in self.transport_segments:
-            segment_type = (segment.get('segment_type') or '').lower()
-            
-            # For car rentals, we only strictly require pick-up info
-            # Drop-off info might be missing in some confirmation emails
-            if segment_type in ['car', 'car_rental']:
-                if not all([
-                    segment.get('departure_location'),
-                    segment.get('departure_datetime')
-                ]):
-                    return False
-            else:
-                # For flights, trains, etc., we need both departure and arrival
-                if not all([
-                    segment.get('departure_location'),
-                    segment.get('arrival_location'),
-                    segment.get('departure_datetime'),
-                    segment.get('arrival_datetime')
-                ]):
-                    return False
-        
-        # Check accommodations have required fields
-        for acc in self.accommodations:
-            if not all([
-                acc.get('property_name'),
-                acc.get('check_in_date'),
-                acc.get('check_out_date')
-            ]):
-                return False
-        
-        # Check activities have required fields
-        for activity in self.activities:
-            if not all([
-                activity.get('activity_name'),
-                activity.get('start_datetime')
-            ]):
-                return False
+        if not transport_complete:
+            return False
         
-        # Check cruises have required fields
-        for cruise in self.cruises:
-            if not all([
-                cruise.get('cruise_line'),
-                cruise.get('departure_datetime'),
-                cruise.get('arrival_datetime')
-            ]):
-                return False
+        # Check accommodations, activities and cruises have required fields
+        for attr, is_complete in _SEGMENT_COMPLETE_CHECKS:
+            for item in getattr(self, attr):
+                if not is_complete(item):
+                    return False
         
         return True
     
-    def is_zurich_local_trip(self) -> bool:
-        """
-        Check if this is a local trip within Zurich area.
-        Migrated from _is_zurich_local_trip in trip_detection_service.py
-        """
-        if not self.is_booking():
-            return False
-        
-        # Define Zurich area locations
-        zurich_area = {
-            'zurich', 'zürich', 'zuerich', 'winterthur', 'uster', 
-            'dübendorf', 'dietikon', 'wetzikon', 'kloten', 'opfikon',
-            'wallisellen', 'bülach', 'regensdorf', 'schlieren',
-            'zurich airport', 'zürich flughafen', 'zrh'
-        }
-        
-        # Check transport segments
-        for segment in self.transport_segments:
-            dep_loc = (segment.get('departure_location') or '').lower()
-            arr_loc = (segment.get('arrival_location') or '').lower()
-            
-            # Check if both locations are in Zurich area
-            dep_in_zurich = any(area in dep_loc for area in zurich_area)
-            arr_in_zurich = any(area in arr_loc for area in zurich_area)
-            
-            if dep_in_zurich and arr_in_zurich:
-                return True
+    def _is_zurich_local_trip(self, has_local_segment: bool) -> bool:
+        """Zurich local trip check given the result of the transport segment scan"""
+        if has_local_segment:
+            return True
         
         # Check if all activities are in Zurich
         if self.activities:
             all_in_zurich = all(
-                any(area in (activity.get('city', '').lower() or 
-                           activity.get('location', '').lower()) 
-                    for area in zurich_area)
+                _ZURICH_AREA_RE.search(activity.get('city') or activity.get('location') or '')
                 for activity in self.activities
             )
             if all_in_zurich:
@@ -215,10 +250,13 @@ class BookingInfo(BaseModel):
         if not self.is_booking():
             return False, f"Non-booking email: {self.non_booking_type}"
         
-        if not self.is_complete():
+        # One pass over transport segments feeds both the completeness and Zurich checks
+        transport_complete, has_local_segment = self._scan_transport_segments()
+        
+        if not self._is_complete(transport_complete):
             return False, "Incomplete booking information"
         
-        if self.is_zurich_local_trip():
+        if self._is_zurich_local_trip(has_local_segment):
             return False, "Local Zurich trip"
         
         # Check for test bookings
@@ -229,11 +267,9 @@ class BookingInfo(BaseModel):
     
     def _is_test_booking(self) -> bool:
         """Check if this appears to be a test booking"""
-        test_indicators = ['test', 'demo', 'sample', 'example']
-        
         # Check confirmation numbers
         for conf_num in self.confirmation_numbers:
-            if any(indicator in conf_num.lower() for indicator in test_indicators):
+            if _TEST_BOOKING_RE.search(conf_num):
                 return True
         
         # Additional info checks can be added here if needed
@@ -330,7 +366,7 @@ class BookingInfo(BaseModel):
     def from_json(cls, json_str: str) -> 'BookingInfo':
         """Create BookingInfo from JSON string"""
         try:
-            data = json.loads(json_str)
+            data = serialization.loads(json_str)
             # Fix any fixable errors before creating the object
             data = cls._fix_booking_data(data)
             return cls.from_dict(data)
@@ -339,9 +375,8 @@ class BookingInfo(BaseModel):
             logger.error(f"Invalid JSON string: {json_str[:500]}...")
             raise
         except Exception as e:
-            logger.error(f"Error parsing booking JSON: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            # logger.exception only formats the traceback if a handler emits the record
+            logger.exception(f"Error parsing booking JSON: {e}")
             raise
     
     @classmethod
@@ -423,7 +458,6 @@ class BookingInfo(BaseModel):
         clean_val = value.replace(',', '')
         
         # Extract the first number found
-        import re
         match = re.search(r'-?\d*\.?\d+', clean_val)
         if match:
             try:
@@ -4,9 +4,9 @@ Trip Repository - handles all Trip persistence operations
 import json
 import logging
 from datetime import datetime
-from typing import List, Optional, Dict, Set
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from typing import List, Optional, Dict, Set, Tuple
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, func, insert, inspect
 
 from backend.database import models as db_models
 from backend.models.trip import Trip, TransportSegment, Accommodation, TourActivity, Cruise
@@ -17,24 +17,41 @@ logger = logging.getLogger(__name__)
 class TripRepository:
     """Repository for Trip domain model persistence"""
     
+    # Trip segment collections: (Trip attribute, email relationship model, relationship id field)
+    SEGMENT_TABLES = (
+        ('transport_segments', db_models.EmailTransportSegment, 'transport_segment_id'),
+        ('accommodations', db_models.EmailAccommodation, 'accommodation_id'),
+        ('tour_activities', db_models.EmailTourActivity, 'tour_activity_id'),
+        ('cruises', db_models.EmailCruise, 'cruise_id'),
+    )
+    
     def __init__(self, session: Session):
         self.session = session
     
+    def _trip_query(self):
+        """Trip query that eager-loads every segment collection and its emails used by Trip.from_db_model"""
+        options = []
+        for attr, _, _ in self.SEGMENT_TABLES:
+            relationship = getattr(db_models.Trip, attr)
+            segment_model = relationship.property.mapper.class_
+            options.append(selectinload(relationship).selectinload(segment_model.emails))
+        return self.session.query(db_models.Trip).options(*options)
+    
     def find_by_id(self, trip_id: int) -> Optional[Trip]:
         """Find a trip by ID"""
-        db_trip = self.session.query(db_models.Trip).filter_by(id=trip_id).first()
+        db_trip = self._trip_query().filter_by(id=trip_id).first()
         if db_trip:
             return Trip.from_db_model(db_trip)
         return None
     
     def find_all(self) -> List[Trip]:
         """Get all trips"""
-        db_trips = self.session.query(db_models.Trip).all()
+        db_trips = self._trip_query().all()
         return [Trip.from_db_model(db_trip) for db_trip in db_trips]
     
     def find_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Trip]:
         """Find trips within a date range"""
-        db_trips = self.session.query(db_models.Trip).filter(
+        db_trips = self._trip_query().filter(
             and_(
                 db_models.Trip.start_date >= start_date.date(),
                 db_models.Trip.end_date <= end_date.date()
@@ -44,7 +61,7 @@ class TripRepository:
     
     def find_overlapping_trips(self, start_date: datetime, end_date: datetime) -> List[Trip]:
         """Find trips that overlap with the given date range"""
-        db_trips = self.session.query(db_models.Trip).filter(
+        db_trips = self._trip_query().filter(
             or_(
                 # Trip starts within the range
                 and_(
@@ -77,16 +94,23 @@ class TripRepository:
             Number of trips saved
         """
         try:
-            # Delete all existing trips
-            self.delete_all()
+            # Delete all existing trips without committing, so the write lock is
+            # held until the new trips are in and the replace is atomic
+            self._delete_all_rows()
+            
+            # Insert all trips with a single executemany INSERT
+            db_trips = [trip.to_db_model() for trip in trips]
+            self._insert_with_ids(db_trips)
             
-            # Save all new trips
-            saved_count = 0
-            for trip in trips:
-                self.save(trip)
-                saved_count += 1
+            # Insert segments and email relationships table by table
+            self._bulk_save_segments(list(zip(trips, db_trips)))
             
             self.session.commit()
+            
+            for trip, db_trip in zip(trips, db_trips):
+                trip.id = db_trip.id
+            
+            saved_count = len(db_trips)
             logger.info(f"Replaced all trips. Saved {saved_count} new trips.")
             return saved_count
             
@@ -167,21 +191,7 @@ class TripRepository:
     def delete_all(self) -> int:
         """Delete all trips. Returns count of deleted trips."""
         try:
-            count = self.session.query(db_models.Trip).count()
-            
-            # Delete all related records
-            self.session.query(db_models.EmailTransportSegment).delete()
-            self.session.query(db_models.EmailAccommodation).delete()
-            self.session.query(db_models.EmailTourActivity).delete()
-            self.session.query(db_models.EmailCruise).delete()
-            
-            self.session.query(db_models.TransportSegment).delete()
-            self.session.query(db_models.Accommodation).delete()
-            self.session.query(db_models.TourActivity).delete()
-            self.session.query(db_models.Cruise).delete()
-            
-            # Delete all trips
-            self.session.query(db_models.Trip).delete()
+            count = self._delete_all_rows()
             self.session.commit()
             
             return count
@@ -191,6 +201,26 @@ class TripRepository:
             self.session.rollback()
             raise
     
+    def _delete_all_rows(self) -> int:
+        """Delete all trips and their segments without committing. Returns count of deleted trips."""
+        count = self.session.query(db_models.Trip).count()
+        
+        # Delete all related records
+        self.session.query(db_models.EmailTransportSegment).delete()
+        self.session.query(db_models.EmailAccommodation).delete()
+        self.session.query(db_models.EmailTourActivity).delete()
+        self.session.query(db_models.EmailCruise).delete()
+        
+        self.session.query(db_models.TransportSegment).delete()
+        self.session.query(db_models.Accommodation).delete()
+        self.session.query(db_models.TourActivity).delete()
+        self.session.query(db_models.Cruise).delete()
+        
+        # Delete all trips
+        self.session.query(db_models.Trip).delete()
+        
+        return count
+    
     def find_by_confirmation_number(self, confirmation_number: str) -> List[Trip]:
         """Find trips containing a specific confirmation number"""
         trips = []
@@ -305,25 +335,107 @@ class TripRepository:
                 cruise.related_email_ids
             )
     
+    def _bulk_save_segments(self, trip_pairs: List[Tuple[Trip, db_models.Trip]]):
+        """
+        Save segments of many newly inserted trips.
+        Issues one executemany INSERT per segment table and per relationship
+        table instead of a flush and two lookups per segment.
+        """
+        # Look up which referenced emails exist in a single pass
+        referenced_email_ids = {
+            email_id
+            for trip, _ in trip_pairs
+            for attr, _, _ in self.SEGMENT_TABLES
+            for segment in getattr(trip, attr)
+            for email_id in segment.related_email_ids
+        }
+        known_email_ids = self._find_existing_email_ids(referenced_email_ids)
+        
+        for attr, relationship_model, id_field in self.SEGMENT_TABLES:
+            segment_pairs = [
+                (segment, segment.to_db_model(db_trip.id))
+                for trip, db_trip in trip_pairs
+                for segment in getattr(trip, attr)
+            ]
+            if not segment_pairs:
+                continue
+            
+            self._insert_with_ids([db_segment for _, db_segment in segment_pairs])
+            
+            relationship_rows = [
+                {'email_id': email_id, id_field: db_segment.id}
+                for segment, db_segment in segment_pairs
+                for email_id in set(segment.related_email_ids)
+                if email_id in known_email_ids
+            ]
+            if relationship_rows:
+                self.session.execute(relationship_model.__table__.insert(), relationship_rows)
+    
+    def _insert_with_ids(self, db_objects: List[db_models.Base]) -> None:
+        """
+        Insert new objects of one model as plain rows and set their IDs.
+        Skips the unit of work: missing IDs are assigned after the table's
+        current MAX(id) and the rows go out as a single executemany INSERT, since
+        INSERT ... RETURNING runs once per row on SQLite. The objects are not
+        added to the session. Must run after a write in the same transaction
+        so no other writer can take those IDs in between.
+        """
+        if not db_objects:
+            return
+        
+        model = type(db_objects[0])
+        column_keys = {column.key for column in model.__table__.columns}
+        # Only pass attributes set by to_db_model so column defaults still apply
+        rows = [
+            {
+                key: value for key, value in inspect(db_object).dict.items()
+                if key in column_keys and not (key == 'id' and value is None)
+            }
+            for db_object in db_objects
+        ]
+        
+        # Keep explicit IDs and number the rest after every ID already taken
+        next_id = max(
+            self.session.query(func.max(model.id)).scalar() or 0,
+            max((row['id'] for row in rows if 'id' in row), default=0)
+        ) + 1
+        for db_object, row in zip(db_objects, rows):
+            if 'id' not in row:
+                db_object.id = row['id'] = next_id
+                next_id += 1
+        
+        self.session.execute(insert(model), rows)
+    
+    def _find_existing_email_ids(self, email_ids: Set[str]) -> Set[str]:
+        """Return the subset of email IDs that exist in the emails table"""
+        email_ids = list(email_ids)
+        existing = set()
+        # Chunk the IN list to stay under SQLite's bound parameter limit
+        for i in range(0, len(email_ids), 500):
+            rows = self.session.query(db_models.Email.email_id).filter(
+                db_models.Email.email_id.in_(email_ids[i:i + 500])
+            ).all()
+            existing.update(row[0] for row in rows)
+        return existing
+    
     def _add_email_relationships(self, relationship_model, id_field: str, entity_id: int, email_ids: List[str]):
         """Add email relationships for an entity"""
-        # Remove duplicates
-        unique_email_ids = list(set(email_ids))
+        # Check which emails exist with a single IN query (also removes duplicates)
+        known_email_ids = self._find_existing_email_ids(set(email_ids))
+        if not known_email_ids:
+            return
         
-        for email_id in unique_email_ids:
-            # Check if email exists
-            email_exists = self.session.query(db_models.Email).filter_by(email_id=email_id).first()
-            if email_exists:
-                relationship_data = {
-                    'email_id': email_id,
-                    id_field: entity_id
-                }
-                
-                # Check if relationship already exists
-                existing = self.session.query(relationship_model).filter_by(**relationship_data).first()
-                if not existing:
-                    relationship = relationship_model(**relationship_data)
-                    self.session.add(relationship)
+        # Check which relationships already exist in one query
+        existing = {
+            row[0] for row in self.session.query(relationship_model.email_id).filter(
+                getattr(relationship_model, id_field) == entity_id,
+                relationship_model.email_id.in_(known_email_ids)
+            ).all()
+        }
+        
+        for email_id in known_email_ids - existing:
+            relationship = relationship_model(email_id=email_id, **{id_field: entity_id})
+            self.session.add(relationship)
     
     def get_statistics(self) -> Dict:
         """Get trip statistics"""
@@ -370,26 +482,22 @@ class TripRepository:
             Merged list of trip dictionaries
         """
         try:
-            # Create a map of existing trips by name for easy lookup
-            existing_trip_map = {}
-            for trip in existing_data:
-                trip_name = trip.get('name', 'Unknown')
-                existing_trip_map[trip_name] = trip
-            
             # Start with all existing trips
             merged_trips = existing_data.copy()
             
+            # Index existing trips by name so updates are a dict lookup, not a rescan
+            existing_trip_index = {}
+            for i, trip in enumerate(merged_trips):
+                existing_trip_index.setdefault(trip.get('name', 'Unknown'), i)
+            
             # Add or update with new trips
             for new_trip in new_data:
                 new_trip_name = new_trip.get('name', 'Unknown')
                 
-                if new_trip_name in existing_trip_map:
+                if new_trip_name in existing_trip_index:
                     # This trip exists, replace it with the updated version
-                    for i, trip in enumerate(merged_trips):
-                        if trip.get('name') == new_trip_name:
-                            merged_trips[i] = new_trip
-                            logger.info(f"Updated existing trip: {new_trip_name}")
-                            break
+                    merged_trips[existing_trip_index[new_trip_name]] = new_trip
+                    logger.info(f"Updated existing trip: {new_trip_name}")
                 else:
                     # This is a new trip, add it
                     merged_trips.append(new_trip)
@@ -5,15 +5,30 @@ from pydantic import BaseModel, Field, validator, ValidationError
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from enum import Enum
+from functools import lru_cache
 import json
 import logging
 
 from backend.database import models as db_models
+from backend.lib import serialization
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8192)
+def _parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 string; memoized because trips repeat the same dates"""
+    return datetime.fromisoformat(value)
+
+
+def _to_datetime(value: Any) -> Any:
+    """Convert ISO strings to datetime, passing through non-string values"""
+    if isinstance(value, str):
+        return _parse_iso_datetime(value)
+    return value
+
+
 class Location(BaseModel):
     city: str
     country: Optional[str] = None
@@ -248,7 +263,7 @@ class Cruise(BaseModel):
             ship_name=self.ship_name,
             departure_datetime=self.departure_datetime,
             arrival_datetime=self.arrival_datetime,
-            itinerary=json.dumps(self.itinerary),
+            itinerary=serialization.dumps(self.itinerary),
             cost=self.cost,
             booking_platform=self.booking_platform,
             confirmation_number=self.confirmation_number,
@@ -264,7 +279,7 @@ class Cruise(BaseModel):
             ship_name=db_cruise.ship_name,
             departure_datetime=db_cruise.departure_datetime,
             arrival_datetime=db_cruise.arrival_datetime,
-            itinerary=json.loads(db_cruise.itinerary) if db_cruise.itinerary else [],
+            itinerary=serialization.loads(db_cruise.itinerary) if db_cruise.itinerary else [],
             cost=db_cruise.cost or 0.0,
             booking_platform=db_cruise.booking_platform,
             confirmation_number=db_cruise.confirmation_number,
@@ -355,8 +370,8 @@ class Trip(BaseModel):
         
         # Validate dates
         try:
-            start_date = datetime.fromisoformat(data['start_date']) if isinstance(data['start_date'], str) else data['start_date']
-            end_date = datetime.fromisoformat(data['end_date']) if isinstance(data['end_date'], str) else data['end_date']
+            start_date = _to_datetime(data['start_date'])
+            end_date = _to_datetime(data['end_date'])
             if end_date < start_date:
                 raise ValueError("Trip end_date must be after start_date")
         except (ValueError, TypeError) as e:
@@ -415,29 +430,30 @@ class Trip(BaseModel):
         
         try:
             # Parse dates
-            start_date = datetime.fromisoformat(data['start_date']) if isinstance(data['start_date'], str) else data['start_date']
-            end_date = datetime.fromisoformat(data['end_date']) if isinstance(data['end_date'], str) else data['end_date']
+            start_date = _to_datetime(data['start_date'])
+            end_date = _to_datetime(data['end_date'])
             
             # Create segments with validation
             transport_segments = []
             for i, seg_data in enumerate(data.get('transport_segments', [])):
+                get = seg_data.get
                 try:
                     segment = TransportSegment(
-                        segment_type=seg_data.get('segment_type', ''),
-                        departure_location=seg_data.get('departure_location', ''),
-                        arrival_location=seg_data.get('arrival_location', ''),
-                        departure_datetime=datetime.fromisoformat(seg_data['departure_datetime']) if isinstance(seg_data['departure_datetime'], str) else seg_data['departure_datetime'],
-                        arrival_datetime=datetime.fromisoformat(seg_data['arrival_datetime']) if isinstance(seg_data['arrival_datetime'], str) else seg_data['arrival_datetime'],
-                        carrier_name=seg_data.get('carrier_name'),
-                        segment_number=seg_data.get('segment_number'),
-                        distance_km=seg_data.get('distance_km'),
-                        distance_type=seg_data.get('distance_type'),
-                        cost=seg_data.get('cost') or 0.0,
-                        booking_platform=seg_data.get('booking_platform'),
-                        confirmation_number=seg_data.get('confirmation_number'),
-                        status=seg_data.get('status', 'confirmed'),
-                        is_latest_version=seg_data.get('is_latest_version', True),
-                        related_email_ids=seg_data.get('related_email_ids', [])
+                        segment_type=get('segment_type', ''),
+                        departure_location=get('departure_location', ''),
+                        arrival_location=get('arrival_location', ''),
+                        departure_datetime=_to_datetime(seg_data['departure_datetime']),
+                        arrival_datetime=_to_datetime(seg_data['arrival_datetime']),
+                        carrier_name=get('carrier_name'),
+                        segment_number=get('segment_number'),
+                        distance_km=get('distance_km'),
+                        distance_type=get('distance_type'),
+                        cost=get('cost') or 0.0,
+                        booking_platform=get('booking_platform'),
+                        confirmation_number=get('confirmation_number'),
+                        status=get('status', 'confirmed'),
+                        is_latest_version=get('is_latest_version', True),
+                        related_email_ids=get('related_email_ids', [])
                     )
                     transport_segments.append(segment)
                 except (ValueError, ValidationError) as e:
@@ -446,20 +462,21 @@ class Trip(BaseModel):
             # Create accommodations
             accommodations = []
             for i, acc_data in enumerate(data.get('accommodations', [])):
+                get = acc_data.get
                 try:
                     accommodation = Accommodation(
-                        property_name=acc_data.get('property_name', ''),
-                        check_in_date=datetime.fromisoformat(acc_data['check_in_date']) if isinstance(acc_data['check_in_date'], str) else acc_data['check_in_date'],
-                        check_out_date=datetime.fromisoformat(acc_data['check_out_date']) if isinstance(acc_data['check_out_date'], str) else acc_data['check_out_date'],
-                        address=acc_data.get('address'),
-                        city=acc_data.get('city'),
-                        country=acc_data.get('country'),
-                        cost=acc_data.get('cost') or 0.0,
-                        booking_platform=acc_data.get('booking_platform'),
-                        confirmation_number=acc_data.get('confirmation_number'),
-                        status=acc_data.get('status', 'confirmed'),
-                        is_latest_version=acc_data.get('is_latest_version', True),
-                        related_email_ids=acc_data.get('related_email_ids', [])
+                        property_name=get('property_name', ''),
+                        check_in_date=_to_datetime(acc_data['check_in_date']),
+                        check_out_date=_to_datetime(acc_data['check_out_date']),
+                        address=get('address'),
+                        city=get('city'),
+                        country=get('country'),
+                        cost=get('cost') or 0.0,
+                        booking_platform=get('booking_platform'),
+                        confirmation_number=get('confirmation_number'),
+                        status=get('status', 'confirmed'),
+                        is_latest_version=get('is_latest_version', True),
+                        related_email_ids=get('related_email_ids', [])
                     )
                     accommodations.append(accommodation)
                 except (ValueError, ValidationError) as e:
@@ -468,20 +485,21 @@ class Trip(BaseModel):
             # Create activities
             tour_activities = []
             for i, act_data in enumerate(data.get('tour_activities', [])):
+                get = act_data.get
                 try:
                     activity = TourActivity(
-                        activity_name=act_data.get('activity_name', ''),
-                        start_datetime=datetime.fromisoformat(act_data['start_datetime']) if isinstance(act_data['start_datetime'], str) else act_data['start_datetime'],
-                        end_datetime=(datetime.fromisoformat(act_data['end_datetime']) if isinstance(act_data['end_datetime'], str) else act_data['end_datetime']) if act_data.get('end_datetime') else None,
-                        description=act_data.get('description'),
-                        location=act_data.get('location'),
-                        city=act_data.get('city'),
-                        cost=act_data.get('cost') or 0.0,
-                        booking_platform=act_data.get('booking_platform'),
-                        confirmation_number=act_data.get('confirmation_number'),
-                        status=act_data.get('status', 'confirmed'),
-                        is_latest_version=act_data.get('is_latest_version', True),
-                        related_email_ids=act_data.get('related_email_ids', [])
+                        activity_name=get('activity_name', ''),
+                        start_datetime=_to_datetime(act_data['start_datetime']),
+                        end_datetime=_to_datetime(act_data['end_datetime']) if get('end_datetime') else None,
+                        description=get('description'),
+                        location=get('location'),
+                        city=get('city'),
+                        cost=get('cost') or 0.0,
+                        booking_platform=get('booking_platform'),
+                        confirmation_number=get('confirmation_number'),
+                        status=get('status', 'confirmed'),
+                        is_latest_version=get('is_latest_version', True),
+                        related_email_ids=get('related_email_ids', [])
                     )
                     tour_activities.append(activity)
                 except (ValueError, ValidationError) as e:
@@ -490,19 +508,20 @@ class Trip(BaseModel):
             # Create cruises
             cruises = []
             for i, cruise_data in enumerate(data.get('cruises', [])):
+                get = cruise_data.get
                 try:
                     cruise = Cruise(
-                        cruise_line=cruise_data.get('cruise_line', ''),
-                        ship_name=cruise_data.get('ship_name'),
-                        departure_datetime=datetime.fromisoformat(cruise_data['departure_datetime']) if isinstance(cruise_data['departure_datetime'], str) else cruise_data['departure_datetime'],
-                        arrival_datetime=datetime.fromisoformat(cruise_data['arrival_datetime']) if isinstance(cruise_data['arrival_datetime'], str) else cruise_data['arrival_datetime'],
-                        itinerary=cruise_data.get('itinerary', []),
-                        cost=cruise_data.get('cost') or 0.0,
-                        booking_platform=cruise_data.get('booking_platform'),
-                        confirmation_number=cruise_data.get('confirmation_number'),
-                        status=cruise_data.get('status', 'confirmed'),
-                        is_latest_version=cruise_data.get('is_latest_version', True),
-                        related_email_ids=cruise_data.get('related_email_ids', [])
+                        cruise_line=get('cruise_line', ''),
+                        ship_name=get('ship_name'),
+                        departure_datetime=_to_datetime(cruise_data['departure_datetime']),
+                        arrival_datetime=_to_datetime(cruise_data['arrival_datetime']),
+                        itinerary=get('itinerary', []),
+                        cost=get('cost') or 0.0,
+                        booking_platform=get('booking_platform'),
+                        confirmation_number=get('confirmation_number'),
+                        status=get('status', 'confirmed'),
+                        is_latest_version=get('is_latest_version', True),
+                        related_email_ids=get('related_email_ids', [])
                     )
                     cruises.append(cruise)
                 except (ValueError, ValidationError) as e:
@@ -544,8 +563,8 @@ class Trip(BaseModel):
             end_date=self.end_date.date() if hasattr(self.end_date, 'date') else self.end_date,
             total_cost=self.total_cost,
             origin_city=self.origin_city,
-            cities_visited=json.dumps(self.cities_visited),
-            ai_analysis=json.dumps(self.ai_analysis)
+            cities_visited=serialization.dumps(self.cities_visited),
+            ai_analysis=serialization.dumps(self.ai_analysis)
         )
     
     @classmethod
@@ -568,13 +587,13 @@ class Trip(BaseModel):
             start_date=start_date,
             end_date=end_date,
             origin_city=db_trip.origin_city,
-            cities_visited=json.loads(db_trip.cities_visited) if db_trip.cities_visited else [],
+            cities_visited=serialization.loads(db_trip.cities_visited) if db_trip.cities_visited else [],
             total_cost=db_trip.total_cost or 0.0,
             transport_segments=transport_segments,
             accommodations=accommodations,
             tour_activities=tour_activities,
             cruises=cruises,
-            ai_analysis=json.loads(db_trip.ai_analysis) if db_trip.ai_analysis else {},
+            ai_analysis=serialization.loads(db_trip.ai_analysis) if db_trip.ai_analysis else {},
             created_at=db_trip.created_at,
             updated_at=db_trip.updated_at
         )
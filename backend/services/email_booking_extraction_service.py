@@ -6,10 +6,12 @@ import json
 import logging
 from datetime import datetime
 from typing import List, Dict, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from backend.database.config import SessionLocal
 from backend.database.models import Email, EmailContent
+from backend.lib import serialization
 from backend.lib.config_manager import config_manager
 from backend.lib.ai.ai_provider_with_fallback import AIProviderWithFallback
 from backend.lib.booking_extractor import BookingExtractor
@@ -128,24 +130,23 @@ class EmailBookingExtractionService:
     def _sync_non_travel_emails_status(self, db: Session):
         """Sync booking extraction status for non-travel emails"""
         try:
-            # First get the email IDs of non-travel emails
-            non_travel_email_ids = [row[0] for row in db.query(Email.email_id).filter(
+            # Non-travel email IDs as a subquery, so the update runs entirely in the database
+            non_travel_email_ids = select(Email.email_id).where(
                 ~Email.classification.in_(TRAVEL_CATEGORIES)
-            ).all()]
-            
-            if non_travel_email_ids:
-                # Update non-travel emails with pending booking extraction status to 'not_travel'
-                updated_count = db.query(EmailContent).filter(
-                    EmailContent.email_id.in_(non_travel_email_ids),
-                    EmailContent.booking_extraction_status == 'pending'
-                ).update({
-                    'booking_extraction_status': 'not_travel',
-                    'booking_extraction_error': 'Not a travel email'
-                }, synchronize_session=False)
-                
-                if updated_count > 0:
-                    db.commit()
-                    logger.info(f"Updated {updated_count} non-travel emails to booking_extraction_status='not_travel'")
+            )
+            
+            # Update non-travel emails with pending booking extraction status to 'not_travel'
+            updated_count = db.query(EmailContent).filter(
+                EmailContent.email_id.in_(non_travel_email_ids),
+                EmailContent.booking_extraction_status == 'pending'
+            ).update({
+                'booking_extraction_status': 'not_travel',
+                'booking_extraction_error': 'Not a travel email'
+            }, synchronize_session=False)
+            
+            if updated_count > 0:
+                db.commit()
+                logger.info(f"Updated {updated_count} non-travel emails to booking_extraction_status='not_travel'")
                 
         except Exception as e:
             db.rollback()
@@ -290,7 +291,7 @@ class EmailBookingExtractionService:
                 'classification': email.classification,
                 'content_text': content.content_text,
                 'content_html': content.content_html,
-                'attachments': json.loads(content.attachments_info or '[]')
+                'attachments': serialization.loads(content.attachments_info or '[]')
             }
             
             # Use booking extractor
@@ -371,36 +372,32 @@ class EmailBookingExtractionService:
             # Import Email model
             from backend.database.models import Email
             
-            # Get travel and non-travel email IDs
-            travel_email_ids = [row[0] for row in db.query(Email.email_id).filter(
+            # Travel and non-travel email IDs as subqueries, so both updates run entirely in the database
+            travel_email_ids = select(Email.email_id).where(
                 Email.classification.in_(TRAVEL_CATEGORIES)
-            ).all()]
+            )
             
-            non_travel_email_ids = [row[0] for row in db.query(Email.email_id).filter(
+            non_travel_email_ids = select(Email.email_id).where(
                 ~Email.classification.in_(TRAVEL_CATEGORIES)
-            ).all()]
+            )
             
             # Reset travel emails to pending
-            travel_reset_count = 0
-            if travel_email_ids:
-                travel_reset_count = db.query(EmailContent).filter(
-                    EmailContent.email_id.in_(travel_email_ids)
-                ).update({
-                    'booking_extraction_status': 'pending',
-                    'booking_extraction_error': None,
-                    'extracted_booking_info': None
-                }, synchronize_session=False)
+            travel_reset_count = db.query(EmailContent).filter(
+                EmailContent.email_id.in_(travel_email_ids)
+            ).update({
+                'booking_extraction_status': 'pending',
+                'booking_extraction_error': None,
+                'extracted_booking_info': None
+            }, synchronize_session=False)
             
             # Mark non-travel emails as not_travel
-            non_travel_reset_count = 0
-            if non_travel_email_ids:
-                non_travel_reset_count = db.query(EmailContent).filter(
-                    EmailContent.email_id.in_(non_travel_email_ids)
-                ).update({
-                    'booking_extraction_status': 'not_travel',
-                    'booking_extraction_error': 'Not a travel email',
-                    'extracted_booking_info': None
-                }, synchronize_session=False)
+            non_travel_reset_count = db.query(EmailContent).filter(
+                EmailContent.email_id.in_(non_travel_email_ids)
+            ).update({
+                'booking_extraction_status': 'not_travel',
+                'booking_extraction_error': 'Not a travel email',
+                'extracted_booking_info': None
+            }, synchronize_session=False)
             
             reset_count = travel_reset_count + non_travel_reset_count
             db.commit()
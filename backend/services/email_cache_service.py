@@ -4,6 +4,7 @@ from typing import Dict, List, Optional
 import threading
 import time
 import logging
+from sqlalchemy import insert
 
 from backend.lib.gmail_client import GmailClient
 from backend.lib.email_cache_db import EmailCacheDB
@@ -153,40 +154,36 @@ class EmailCacheService:
     def _save_emails_to_database(self, emails: List[Dict]) -> int:
         """Save emails to database and return count saved"""
         db = SessionLocal()
-        saved_count = 0
+        new_rows = []
         
         try:
+            # Look up which emails already exist with one indexed IN query for the whole batch
+            existing_ids = {
+                row[0] for row in db.query(Email.email_id).filter(
+                    Email.email_id.in_([email_data['email_id'] for email_data in emails])
+                )
+            }
+            
             for email_data in emails:
-                # Check if email already exists
-                existing = db.query(Email).filter_by(
-                    email_id=email_data['email_id']
-                ).first()
-                
-                if not existing:
+                if email_data['email_id'] not in existing_ids:
+                    existing_ids.add(email_data['email_id'])
                     # Map fields correctly (from -> sender)
                     email_fields = {
                         'email_id': email_data['email_id'],
                         'subject': email_data.get('subject'),
                         'sender': email_data.get('from'),  # Map 'from' to 'sender'
                         'date': email_data.get('date'),
+                        # Memoized parse, repeated Date headers are only parsed once
+                        'timestamp': self.email_cache.parse_email_date(email_data.get('date')),
                         'classification': 'unclassified'
                     }
-                    
-                    # Parse timestamp if date is available
-                    if email_fields['date']:
-                        try:
-                            from email.utils import parsedate_to_datetime
-                            email_fields['timestamp'] = parsedate_to_datetime(email_fields['date'])
-                        except Exception as e:
-                            logger = logging.getLogger(__name__)
-                            logger.warning(f"Failed to parse date for email {email_data['email_id']}: {e}")
-                    
-                    email = Email(**email_fields)
-                    db.add(email)
-                    saved_count += 1
+                    new_rows.append(email_fields)
             
+            # Insert all new rows with a single executemany
+            if new_rows:
+                db.execute(insert(Email), new_rows)
             db.commit()
-            return saved_count
+            return len(new_rows)
             
         except Exception as e:
             db.rollback()
@@ -212,34 +209,14 @@ class EmailCacheService:
             # Use microservice to import
             self.import_progress['message'] = f'Searching for emails from {start_date.date()} to {end_date.date()}...'
             
-            import_result = self.import_micro.import_emails_by_date_range(
-                start_date, end_date
-            )
-            
-            total_found = import_result['total_found']
-            new_emails = import_result['emails']
-            
-            if not new_emails:
-                with self._lock:
-                    self.import_progress.update({
-                        'finished': True,
-                        'message': f'No new emails found. {import_result["skipped_count"]} already imported.',
-                        'is_running': False,
-                        'total': total_found,
-                        'skip_count': import_result['skipped_count']
-                    })
-                return
-            
-            self.import_progress.update({
-                'total': total_found,
-                'message': f'Found {len(new_emails)} new emails to import. Processing...'
-            })
-            
-            # Save emails to database in batches
-            batch_size = 50
+            total_found = 0
+            skipped_count = 0
+            new_found = 0
             saved_count = 0
             
-            for i in range(0, len(new_emails), batch_size):
+            # Save each Gmail list page as soon as its headers arrive; the next page is
+            # listed meanwhile, and the total grows page by page
+            for page in self.import_micro.iter_import_pages(start_date, end_date):
                 # Check stop flag
                 if self._stop_flag.is_set():
                     with self._lock:
@@ -250,140 +227,33 @@ class EmailCacheService:
                         })
                     return
                 
-                batch = new_emails[i:i + batch_size]
-                batch_saved = self._save_emails_to_database(batch)
-                saved_count += batch_saved
+                total_found += page['found']
+                skipped_count += page['skipped']
+                new_found += len(page['emails'])
+                
+                if page['emails']:
+                    saved_count += self._save_emails_to_database(page['emails'])
                 
                 # Update progress
                 self.import_progress.update({
-                    'current': min(i + batch_size, len(new_emails)),
-                    'new_count': saved_count,
-                    'skip_count': import_result['skipped_count'],
-                    'message': f'Saving emails... {saved_count}/{len(new_emails)}'
-                })
-            
-            # Get final stats
-            final_stats = self.email_cache.get_statistics()
-            
-            # Mark as finished
-            with self._lock:
-                self.import_progress.update({
-                    'finished': True,
-                    'is_running': False,
-                    'message': f'Import completed. Imported {saved_count} new emails.',
+                    'total': total_found,
+                    'current': total_found,
                     'new_count': saved_count,
-                    'skip_count': import_result['skipped_count'],
-                    'final_results': {
-                        'total_in_cache': final_stats['total_emails'],
-                        'new_emails_added': saved_count,
-                        'skipped_existing': import_result['skipped_count']
-                    }
+                    'skip_count': skipped_count,
+                    'message': f'Saving emails... {saved_count} new of {total_found} found so far'
                 })
             
-            logger.info(f"Import finished: {saved_count} new, {import_result['skipped_count']} skipped")
-            
-        except Exception as e:
-            logger.error(f"Error during background import: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            with self._lock:
-                self.import_progress.update({
-                    'finished': True,
-                    'is_running': False,
-                    'error': str(e),
-                    'message': f'Import failed: {str(e)}'
-                })
-    
-    def _background_import(self, days: int):
-        """Background thread for importing emails"""
-        import logging
-        logger = logging.getLogger(__name__)
-        
-        try:
-            logger.info(f"Background import started for {days} days")
-            
-            self.import_progress.update({
-                'message': 'Connecting to Gmail...',
-                'current': 0,
-                'total': 0
-            })
-            
-            # Search for emails from the specified time period
-            self.import_progress['message'] = f'Searching for emails from the last {days} days...'
-            logger.info(f"Calling gmail_client.search_emails_by_date({days})")
-            messages = self.gmail_client.search_emails_by_date(days)
-            logger.info(f"Got {len(messages) if messages else 0} messages from Gmail")
-            
-            if not messages:
+            if not new_found:
                 with self._lock:
                     self.import_progress.update({
                         'finished': True,
-                        'message': 'No emails found for the specified date range',
-                        'is_running': False
+                        'message': f'No new emails found. {skipped_count} already imported.',
+                        'is_running': False,
+                        'total': total_found,
+                        'skip_count': skipped_count
                     })
                 return
             
-            self.import_progress.update({
-                'total': len(messages),
-                'message': f'Found {len(messages)} emails. Processing...'
-            })
-            
-            # Get existing email IDs to avoid duplicates
-            logger.info("Getting existing email IDs from cache...")
-            existing_ids = self.email_cache.get_cached_ids()
-            logger.info(f"Found {len(existing_ids)} existing email IDs in cache")
-            
-            # Debug: print first few IDs from both sources
-            if existing_ids:
-                logger.debug(f"Sample existing IDs: {list(existing_ids)[:3]}")
-            if messages:
-                logger.debug(f"Sample message IDs from Gmail: {[msg['id'] for msg in messages[:3]]}")
-            
-            # Process emails individually and add to database immediately
-            new_emails = []
-            new_count = 0
-            skip_count = 0
-            
-            for i, message in enumerate(messages):
-                # Check stop flag
-                if self._stop_flag.is_set():
-                    with self._lock:
-                        self.import_progress.update({
-                            'finished': True,
-                            'is_running': False,
-                            'message': f'Import stopped by user. Processed {i} emails.'
-                        })
-                    return
-                
-                if message['id'] not in existing_ids:
-                    logger.debug(f"Processing new email: {message['id']}")
-                    # Get email headers
-                    headers = self.gmail_client.get_message_headers(message['id'])
-                    headers['email_id'] = message['id']
-                    new_emails.append(headers)
-                    new_count += 1
-                    logger.debug(f"Added email: {headers.get('subject', 'No subject')[:50]}")
-                    
-                    # Add to database immediately
-                    try:
-                        added_count = self.email_cache.add_emails([headers])
-                        logger.debug(f"Added {added_count} email to database")
-                    except Exception as e:
-                        logger.error(f"Error saving email to database: {e}")
-                        import traceback
-                        logger.error(traceback.format_exc())
-                else:
-                    skip_count += 1
-                    logger.debug(f"Skipping existing email: {message['id']}")
-                
-                # Update progress
-                self.import_progress.update({
-                    'current': i + 1,
-                    'new_count': new_count,
-                    'skip_count': skip_count,
-                    'message': f'Processing email {i + 1}/{len(messages)}...'
-                })
-            
             # Get final stats
             final_stats = self.email_cache.get_statistics()
             
@@ -392,20 +262,22 @@ class EmailCacheService:
                 self.import_progress.update({
                     'finished': True,
                     'is_running': False,
-                    'message': f'Import completed. Total emails processed: {self.import_progress["current"]}',
+                    'message': f'Import completed. Imported {saved_count} new emails.',
+                    'new_count': saved_count,
+                    'skip_count': skipped_count,
                     'final_results': {
-                        'new_emails': new_count,
-                        'skipped_emails': skip_count,
-                        'total_cached': final_stats.get('total_emails', 0),
-                        'date_range': final_stats.get('date_range')
+                        'total_in_cache': final_stats['total_emails'],
+                        'new_emails_added': saved_count,
+                        'skipped_existing': skipped_count
                     }
                 })
             
+            logger.info(f"Import finished: {saved_count} new, {skipped_count} skipped")
+            
         except Exception as e:
-            logger.error(f"Import failed: {e}")
+            logger.error(f"Error during background import: {e}")
             import traceback
             logger.error(traceback.format_exc())
-            
             with self._lock:
                 self.import_progress.update({
                     'finished': True,
@@ -11,6 +11,7 @@ from backend.lib.ai.ai_provider_with_fallback import AIProviderWithFallback
 from backend.services.micro.classification_micro_service import ClassificationMicroService
 from backend.database.config import SessionLocal
 from backend.database.models import Email, ClassificationStats
+from backend.constants import TRAVEL_CATEGORIES_SET
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -303,8 +304,7 @@ class EmailClassificationService:
                 logger.info(f"Found {failed_count} failed classifications - keeping as unclassified for retry")
             
             # Count travel-related emails
-            travel_categories = {'flight', 'hotel', 'car_rental', 'train', 'cruise', 'tour', 'travel_insurance', 'flight_change', 'hotel_change', 'other_travel'}
-            travel_count = sum(1 for r in all_results if r['classification'] in travel_categories)
+            travel_count = sum(1 for r in all_results if r['classification'] in TRAVEL_CATEGORIES_SET)
             
             # Log second-tier verification summary
             if self.classification_progress.get('second_tier_verified', 0) > 0:
@@ -336,11 +336,9 @@ class EmailClassificationService:
     
     def _perform_second_tier_verification(self, first_tier_results: List[Dict]) -> List[Dict]:
         """Perform second-tier verification on travel-related emails"""
-        from backend.constants import TRAVEL_CATEGORIES
-        
         # Filter travel emails from first tier
         travel_email_ids = [c['email_id'] for c in first_tier_results 
-                           if c.get('classification') in TRAVEL_CATEGORIES]
+                           if c.get('classification') in TRAVEL_CATEGORIES_SET]
         
         if not travel_email_ids:
             return first_tier_results
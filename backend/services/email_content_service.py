@@ -7,8 +7,9 @@ import logging
 import threading
 from typing import Dict, List, Optional
 from datetime import datetime
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 
+from backend.lib import serialization
 from backend.lib.gmail_client import GmailClient
 from backend.lib.email_content_extractor import EmailContentExtractor
 from backend.lib.config_manager import config_manager
@@ -109,8 +110,12 @@ class EmailContentService:
         finally:
             db.close()
     
-    def get_travel_emails_for_extraction(self) -> List[Dict]:
-        """获取需要提取内容的旅行相关邮件"""
+    def get_travel_emails_for_extraction(self, limit: Optional[int] = None) -> List[Dict]:
+        """获取需要提取内容的旅行相关邮件
+
+        Args:
+            limit: 最多返回的邮件数量，在数据库查询中限制
+        """
         db = SessionLocal()
         try:
             # 查询所有旅行相关邮件，且还未成功提取内容的
@@ -120,11 +125,16 @@ class EmailContentService:
                 EmailContent.extraction_status.in_(['completed', 'not_required'])
             ).subquery()
             
-            # 查询旅行邮件且不在已提取列表中
-            emails = db.query(Email).filter(
+            # 查询旅行邮件且不在已提取列表中（只取需要的字段，数量限制交给数据库）
+            query = db.query(
+                Email.email_id, Email.subject, Email.sender, Email.date, Email.classification
+            ).filter(
                 Email.classification.in_(TRAVEL_CATEGORIES),
                 ~Email.email_id.in_(extracted_ids)
-            ).all()
+            )
+            if limit:
+                query = query.limit(limit)
+            emails = query.all()
             
             result = []
             for email in emails:
@@ -223,24 +233,23 @@ class EmailContentService:
         """Mark non-travel emails with pending extraction status as not_required"""
         db = SessionLocal()
         try:
-            # First get the email IDs of non-travel emails
-            non_travel_email_ids = [row[0] for row in db.query(Email.email_id).filter(
+            # Non-travel email IDs as a subquery, so the update runs entirely in the database
+            non_travel_email_ids = select(Email.email_id).where(
                 ~Email.classification.in_(TRAVEL_CATEGORIES)
-            ).all()]
-            
-            if non_travel_email_ids:
-                # Find non-travel emails with EmailContent records that have pending extraction status
-                updated_count = db.query(EmailContent).filter(
-                    EmailContent.email_id.in_(non_travel_email_ids),
-                    EmailContent.extraction_status.in_(['pending', 'failed'])
-                ).update({
-                    'extraction_status': 'not_required',
-                    'extraction_error': None
-                }, synchronize_session=False)
-                
-                if updated_count > 0:
-                    db.commit()
-                    logger.info(f"Marked {updated_count} non-travel emails as extraction_status='not_required'")
+            )
+            
+            # Find non-travel emails with EmailContent records that have pending extraction status
+            updated_count = db.query(EmailContent).filter(
+                EmailContent.email_id.in_(non_travel_email_ids),
+                EmailContent.extraction_status.in_(['pending', 'failed'])
+            ).update({
+                'extraction_status': 'not_required',
+                'extraction_error': None
+            }, synchronize_session=False)
+            
+            if updated_count > 0:
+                db.commit()
+                logger.info(f"Marked {updated_count} non-travel emails as extraction_status='not_required'")
             
         except Exception as e:
             db.rollback()
@@ -268,7 +277,7 @@ class EmailContentService:
                 logger.info(f"Using specified email IDs: {len(emails)} emails found")
             else:
                 # 从数据库查询需要提取的旅行邮件
-                emails = self.get_travel_emails_for_extraction()
+                emails = self.get_travel_emails_for_extraction(limit)
             
             logger.debug(f"get_travel_emails_for_extraction returned type: {type(emails)}, length: {len(emails) if emails else 0}")
             
@@ -459,7 +468,7 @@ class EmailContentService:
                 'content_text': content.content_text,
                 'content_html': content.content_html,
                 'has_attachments': content.has_attachments,
-                'attachments': json.loads(content.attachments_info) if content.attachments_info else []
+                'attachments': serialization.loads(content.attachments_info) if content.attachments_info else []
             }
             
             return result
@@ -511,46 +520,42 @@ class EmailContentService:
                     'message': '内容提取正在进行中，请先停止提取'
                 }
             
-            # Get travel and non-travel email IDs
-            travel_email_ids = [row[0] for row in db.query(Email.email_id).filter(
+            # Travel and non-travel email IDs as subqueries, so both updates run entirely in the database
+            travel_email_ids = select(Email.email_id).where(
                 Email.classification.in_(TRAVEL_CATEGORIES)
-            ).all()]
+            )
             
-            non_travel_email_ids = [row[0] for row in db.query(Email.email_id).filter(
+            non_travel_email_ids = select(Email.email_id).where(
                 ~Email.classification.in_(TRAVEL_CATEGORIES)
-            ).all()]
+            )
             
             # Reset travel emails to pending
-            travel_reset_count = 0
-            if travel_email_ids:
-                travel_reset_count = db.query(EmailContent).filter(
-                    EmailContent.email_id.in_(travel_email_ids)
-                ).update({
-                    'extraction_status': 'pending',
-                    'extraction_error': None,
-                    'content_text': None,
-                    'content_html': None,
-                    'attachments_info': None,
-                    'has_attachments': False,
-                    'extracted_at': None,
-                    'attachments_count': 0
-                }, synchronize_session=False)
+            travel_reset_count = db.query(EmailContent).filter(
+                EmailContent.email_id.in_(travel_email_ids)
+            ).update({
+                'extraction_status': 'pending',
+                'extraction_error': None,
+                'content_text': None,
+                'content_html': None,
+                'attachments_info': None,
+                'has_attachments': False,
+                'extracted_at': None,
+                'attachments_count': 0
+            }, synchronize_session=False)
             
             # Mark non-travel emails as not_required
-            non_travel_reset_count = 0
-            if non_travel_email_ids:
-                non_travel_reset_count = db.query(EmailContent).filter(
-                    EmailContent.email_id.in_(non_travel_email_ids)
-                ).update({
-                    'extraction_status': 'not_required',
-                    'extraction_error': None,
-                    'content_text': None,
-                    'content_html': None,
-                    'attachments_info': None,
-                    'has_attachments': False,
-                    'extracted_at': None,
-                    'attachments_count': 0
-                }, synchronize_session=False)
+            non_travel_reset_count = db.query(EmailContent).filter(
+                EmailContent.email_id.in_(non_travel_email_ids)
+            ).update({
+                'extraction_status': 'not_required',
+                'extraction_error': None,
+                'content_text': None,
+                'content_html': None,
+                'attachments_info': None,
+                'has_attachments': False,
+                'extracted_at': None,
+                'attachments_count': 0
+            }, synchronize_session=False)
             
             reset_count = travel_reset_count + non_travel_reset_count
             db.commit()
@@ -255,6 +255,6 @@ class EmailPipelineServiceV2:
                 self.state_manager.update_stage_from_progress(stage_name, progress)
             
             # Wait before next update
-            threading.Event().wait(1)
+            self._stop_flag.wait(1)
         
         logger.info(f"Monitor stages stopped - stop_flag: {self._stop_flag.is_set()}, is_running: {self.state_manager.is_running()}")
\ No newline at end of file
@@ -55,6 +55,52 @@ class ImportMicroService(BaseMicroService):
                 }
             }
         """
+        new_emails = []
+        total_found = 0
+        skipped_count = 0
+        
+        for page in self.iter_import_pages(start_date, end_date, check_existing):
+            new_emails.extend(page['emails'])
+            total_found += page['found']
+            skipped_count += page['skipped']
+        
+        result = {
+            'emails': new_emails,
+            'total_found': total_found,
+            'new_count': len(new_emails),
+            'skipped_count': skipped_count,
+            'date_range': {
+                'start': start_date.isoformat(),
+                'end': end_date.isoformat()
+            }
+        }
+        
+        logger.info(f"Import complete: {result['new_count']} new, {result['skipped_count']} skipped")
+        return result
+    
+    def iter_import_pages(self, 
+                          start_date: datetime, 
+                          end_date: datetime,
+                          check_existing: bool = True):
+        """
+        Import emails for specified date range one Gmail list page at a time
+        
+        Each page is filtered against existing IDs and the headers of its new
+        emails are fetched before it is yielded, while the next list page is
+        already being requested. Callers can save each page as it arrives.
+        
+        Args:
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+            check_existing: Whether to check for existing emails in database
+            
+        Yields:
+            {
+                'emails': List[Dict],  # New emails with headers on this page
+                'found': int,          # Emails listed on this page
+                'skipped': int         # Existing emails skipped on this page
+            }
+        """
         self.log_operation('import_emails_by_date_range', {
             'start_date': start_date.isoformat(),
             'end_date': end_date.isoformat()
@@ -67,50 +113,35 @@ class ImportMicroService(BaseMicroService):
                 existing_ids = self._get_existing_ids()
                 logger.info(f"Found {len(existing_ids)} existing emails in database")
             
-            # Fetch from Gmail
             logger.info(f"Searching emails from {start_date} to {end_date}")
-            messages = self.gmail_client.search_emails_by_date_range(start_date, end_date)
-            logger.info(f"Found {len(messages)} emails in Gmail")
-            
-            # Process and filter
-            new_emails = []
-            skipped_count = 0
+            total_found = 0
             
-            for msg in messages:
-                email_id = msg.get('id')
-                if not email_id:
-                    logger.warning(f"Message without ID found: {msg}")
-                    continue
+            for messages in self.gmail_client.iter_emails_by_date_range_pages(start_date, end_date):
+                total_found += len(messages)
+                new_ids = []
+                skipped = 0
                 
-                if email_id in existing_ids:
-                    skipped_count += 1
-                    logger.debug(f"Skipping existing email: {email_id}")
-                    continue
+                for msg in messages:
+                    email_id = msg.get('id')
+                    if not email_id:
+                        logger.warning(f"Message without ID found: {msg}")
+                        continue
+                    
+                    if email_id in existing_ids:
+                        skipped += 1
+                        logger.debug(f"Skipping existing email: {email_id}")
+                        continue
+                    
+                    new_ids.append(email_id)
                 
-                # Get email headers
-                try:
-                    headers = self.gmail_client.get_message_headers(email_id)
-                    if headers:
-                        headers['email_id'] = email_id
-                        new_emails.append(headers)
-                        logger.debug(f"Added new email: {email_id} - {headers.get('subject', 'No subject')[:50]}")
-                except Exception as e:
-                    logger.error(f"Failed to get headers for email {email_id}: {e}")
-                    continue
-            
-            result = {
-                'emails': new_emails,
-                'total_found': len(messages),
-                'new_count': len(new_emails),
-                'skipped_count': skipped_count,
-                'date_range': {
-                    'start': start_date.isoformat(),
-                    'end': end_date.isoformat()
+                # Get email headers with Gmail batch requests (100 messages per HTTP call)
+                yield {
+                    'emails': self.gmail_client.batch_get_headers(new_ids) if new_ids else [],
+                    'found': len(messages),
+                    'skipped': skipped
                 }
-            }
             
-            logger.info(f"Import complete: {result['new_count']} new, {result['skipped_count']} skipped")
-            return result
+            logger.info(f"Found {total_found} emails in Gmail")
             
         except Exception as e:
             logger.error(f"Import failed: {e}")
@@ -142,7 +173,7 @@ class ImportMicroService(BaseMicroService):
         Returns:
             Set of existing email IDs
         """
-        existing_ids = set(row[0] for row in db.query(Email.email_id).all())
+        existing_ids = {row[0] for row in db.query(Email.email_id).yield_per(1000)}
         return existing_ids
     
     @BaseMicroService.with_db
@@ -2,13 +2,15 @@
 Booking Extraction Stage for Email Pipeline
 """
 import logging
-import threading
 from typing import Dict, List, Optional
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 
 from backend.services.pipeline.base_stage import BasePipelineStage
 from backend.services.email_booking_extraction_service import EmailBookingExtractionService
-from backend.database.models import Email, EmailContent, TransportSegment, Accommodation, TourActivity, Cruise
+from backend.database.models import (
+    Email, EmailContent, EmailTransportSegment, EmailAccommodation,
+    EmailTourActivity, EmailCruise
+)
 from backend.constants import TRAVEL_CATEGORIES
 
 logger = logging.getLogger(__name__)
@@ -110,7 +112,7 @@ class BookingExtractionStage(BasePipelineStage):
                 break
             
             # Wait before checking again
-            threading.Event().wait(1)
+            self._stop_flag.wait(1)
         
         return {}
     
@@ -166,7 +168,7 @@ class BookingExtractionStage(BasePipelineStage):
                                 if progress.get('finished', False):
                                     logger.info("Booking extraction: Extraction finished")
                                     break
-                                threading.Event().wait(1)
+                                self._stop_flag.wait(1)
                         
                         break
                     
@@ -195,35 +197,16 @@ class BookingExtractionStage(BasePipelineStage):
         """Count bookings found in a batch of emails"""
         db = self.get_db_session()
         try:
-            # Count bookings from extracted emails
-            transport_count = 0
-            accommodation_count = 0
-            tour_count = 0
-            cruise_count = 0
-            
-            # Get all transport segments and check their emails
-            transports = db.query(TransportSegment).all()
-            for transport in transports:
-                if any(email.email_id in email_ids for email in transport.emails):
-                    transport_count += 1
-            
-            # Get all accommodations and check their emails
-            accommodations = db.query(Accommodation).all()
-            for accommodation in accommodations:
-                if any(email.email_id in email_ids for email in accommodation.emails):
-                    accommodation_count += 1
-            
-            # Get all tours and check their emails
-            tours = db.query(TourActivity).all()
-            for tour in tours:
-                if any(email.email_id in email_ids for email in tour.emails):
-                    tour_count += 1
-            
-            # Get all cruises and check their emails
-            cruises = db.query(Cruise).all()
-            for cruise in cruises:
-                if any(email.email_id in email_ids for email in cruise.emails):
-                    cruise_count += 1
+            # Count bookings linked to the batch's emails in the database
+            def count_linked(relationship_model, booking_id_column) -> int:
+                return db.query(func.count(func.distinct(booking_id_column))).filter(
+                    relationship_model.email_id.in_(email_ids)
+                ).scalar()
+            
+            transport_count = count_linked(EmailTransportSegment, EmailTransportSegment.transport_segment_id)
+            accommodation_count = count_linked(EmailAccommodation, EmailAccommodation.accommodation_id)
+            tour_count = count_linked(EmailTourActivity, EmailTourActivity.tour_activity_id)
+            cruise_count = count_linked(EmailCruise, EmailCruise.cruise_id)
             
             total_bookings = transport_count + accommodation_count + tour_count + cruise_count
             
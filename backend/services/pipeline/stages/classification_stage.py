@@ -2,7 +2,6 @@
 Classification Stage for Email Pipeline
 """
 import logging
-import threading
 from typing import Dict, List, Optional
 
 from backend.services.pipeline.base_stage import BasePipelineStage
@@ -150,7 +149,7 @@ class ClassificationStage(BasePipelineStage):
                 logger.info("Classification completed")
                 break
             
-            threading.Event().wait(1)
+            self._stop_flag.wait(1)
     
     def _check_classification_progress(self, output_queue):
         """Check classification progress and forward newly classified travel emails"""
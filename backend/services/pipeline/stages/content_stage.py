@@ -2,7 +2,6 @@
 Content Extraction Stage for Email Pipeline
 """
 import logging
-import threading
 from typing import Dict, List, Optional
 from sqlalchemy import and_
 
@@ -107,7 +106,7 @@ class ContentExtractionStage(BasePipelineStage):
                 break
             
             # Wait before checking again
-            threading.Event().wait(1)
+            self._stop_flag.wait(1)
         
         # Return only emails extracted in this batch for booking extraction
         if batch_extracted_email_ids:
@@ -174,7 +173,7 @@ class ContentExtractionStage(BasePipelineStage):
                                 if progress.get('finished', False):
                                     logger.info("Content extraction: Extraction finished")
                                     break
-                                threading.Event().wait(1)
+                                self._stop_flag.wait(1)
                         
                         # Check for any remaining extracted emails
                         self._send_remaining_extracted_emails(output_queue)
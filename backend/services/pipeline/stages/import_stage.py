@@ -88,7 +88,7 @@ class ImportStage(BasePipelineStage):
                 logger.info(f"Processing batch {batch_number + 1} with {len(messages)} emails")
                 
                 # Process this batch
-                new_emails = []
+                new_ids = []
                 batch_skipped = 0
                 
                 for msg in messages:
@@ -96,15 +96,15 @@ class ImportStage(BasePipelineStage):
                     if email_id in self.existing_ids:
                         batch_skipped += 1
                         continue
-                    
-                    # Get email headers
+                    new_ids.append(email_id)
+                
+                # Get email headers with Gmail batch requests (100 messages per HTTP call)
+                new_emails = []
+                if new_ids:
                     try:
-                        headers = self.gmail_client.get_message_headers(email_id)
-                        if headers:
-                            headers['email_id'] = email_id
-                            new_emails.append(headers)
+                        new_emails = self.gmail_client.batch_get_headers(new_ids)
                     except Exception as e:
-                        logger.error(f"Failed to get headers for email {email_id}: {e}")
+                        logger.error(f"Failed to get headers for {len(new_ids)} emails: {e}")
                 
                 # Save new emails to database
                 if new_emails:
@@ -152,8 +152,8 @@ class ImportStage(BasePipelineStage):
         """Load existing email IDs from database"""
         db = self.get_db_session()
         try:
-            existing_ids = db.query(Email.email_id).all()
-            self.existing_ids = set(row[0] for row in existing_ids)
+            # Stream IDs into the set in batches instead of materialising every row first
+            self.existing_ids = {row[0] for row in db.query(Email.email_id).yield_per(1000)}
             logger.info(f"Found {len(self.existing_ids)} existing emails in database")
         finally:
             db.close()
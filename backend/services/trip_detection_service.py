@@ -4,10 +4,11 @@ Trip Detection Service - Database operations and orchestration for trip detectio
 import threading
 import json
 import logging
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Dict, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import List, Dict, Optional, Set, Tuple
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import func, select
 
 from backend.database.config import SessionLocal
 
@@ -67,6 +68,10 @@ class TripDetectionService:
         self._stop_flag = threading.Event()
         self._detection_thread = None
         self._lock = threading.Lock()
+        
+        # (email_id, hash of extracted_booking_info) of emails whose booking info
+        # failed validation, so unchanged ones are not re-parsed on every run
+        self._invalid_booking_keys: Set[Tuple[str, int]] = set()
     
     def start_detection(self, date_range: Optional[Dict] = None) -> Dict:
         """Start trip detection process"""
@@ -147,7 +152,9 @@ class TripDetectionService:
     
     def _background_detection(self, date_range: Optional[Dict] = None):
         """Background process for trip detection"""
-        db = SessionLocal()
+        # Keep loaded emails populated across the per-batch status commits,
+        # otherwise every access after a commit re-SELECTs the row
+        db = SessionLocal(expire_on_commit=False)
         try:
             # Clear existing trips only at the start of the entire detection process
             # This prevents data loss if individual batches fail
@@ -203,7 +210,10 @@ class TripDetectionService:
             
             # Only get emails that have actual booking information
             # Filter out non-booking emails directly in the database
-            query = db.query(Email).join(EmailContent).filter(
+            # Populate email_content from the join to avoid a lazy load per email
+            query = db.query(Email).join(EmailContent).options(
+                contains_eager(Email.email_content)
+            ).filter(
                 Email.classification.in_(TRAVEL_CATEGORIES),
                 EmailContent.extraction_status == 'completed',
                 EmailContent.booking_extraction_status == 'completed',  # This excludes 'no_booking' status
@@ -223,6 +233,13 @@ class TripDetectionService:
             # Order by timestamp for chronological processing
             emails = query.order_by(Email.timestamp.asc()).all()
             
+            # Skip failed emails whose booking info is unchanged since it failed validation
+            if self._invalid_booking_keys:
+                emails = [
+                    email for email in emails
+                    if self._booking_key(email) not in self._invalid_booking_keys
+                ]
+            
             if not emails:
                 with self._lock:
                     self.detection_progress.update({
@@ -282,11 +299,10 @@ class TripDetectionService:
                 # Mark invalid emails as failed
                 if invalid_emails:
                     # Group emails by reason
-                    emails_by_reason = {}
+                    emails_by_reason = defaultdict(list)
                     for email, reason in invalid_emails:
-                        if reason not in emails_by_reason:
-                            emails_by_reason[reason] = []
                         emails_by_reason[reason].append(email)
+                        self._invalid_booking_keys.add(self._booking_key(email))
                     
                     # Mark each group with its specific reason
                     for reason, email_list in emails_by_reason.items():
@@ -429,12 +445,19 @@ class TripDetectionService:
     
     
     
+    @staticmethod
+    def _booking_key(email: Email) -> Tuple[str, int]:
+        """Key identifying an email's current extracted booking info"""
+        return email.email_id, hash(email.email_content.extracted_booking_info)
+    
     def _mark_emails_processing(self, emails: List[Email], db: Session):
         """Mark emails as being processed for trip detection"""
         try:
-            for email in emails:
-                if email.email_content:
-                    email.email_content.trip_detection_status = 'processing'
+            db.query(EmailContent).filter(
+                EmailContent.email_id.in_([email.email_id for email in emails])
+            ).update({
+                EmailContent.trip_detection_status: 'processing'
+            }, synchronize_session=False)
             db.commit()
             logger.info(f"Marked {len(emails)} emails as processing")
         except Exception as e:
@@ -444,11 +467,13 @@ class TripDetectionService:
     def _mark_emails_completed(self, emails: List[Email], db: Session):
         """Mark emails as successfully processed for trip detection"""
         try:
-            for email in emails:
-                if email.email_content:
-                    email.email_content.trip_detection_status = 'completed'
-                    email.email_content.trip_detection_processed_at = datetime.now()
-                    email.email_content.trip_detection_error = None
+            db.query(EmailContent).filter(
+                EmailContent.email_id.in_([email.email_id for email in emails])
+            ).update({
+                EmailContent.trip_detection_status: 'completed',
+                EmailContent.trip_detection_processed_at: datetime.now(),
+                EmailContent.trip_detection_error: None
+            }, synchronize_session=False)
             db.commit()
             logger.info(f"Marked {len(emails)} emails as completed")
         except Exception as e:
@@ -458,10 +483,12 @@ class TripDetectionService:
     def _mark_emails_failed(self, emails: List[Email], db: Session, error_message: str):
         """Mark emails as failed during trip detection"""
         try:
-            for email in emails:
-                if email.email_content:
-                    email.email_content.trip_detection_status = 'failed'
-                    email.email_content.trip_detection_error = error_message
+            db.query(EmailContent).filter(
+                EmailContent.email_id.in_([email.email_id for email in emails])
+            ).update({
+                EmailContent.trip_detection_status: 'failed',
+                EmailContent.trip_detection_error: error_message
+            }, synchronize_session=False)
             db.commit()
             logger.info(f"Marked {len(emails)} emails as failed")
         except Exception as e:
@@ -471,10 +498,12 @@ class TripDetectionService:
     def _mark_emails_pending(self, emails: List[Email], db: Session):
         """Reset emails back to pending status for retry"""
         try:
-            for email in emails:
-                if email.email_content:
-                    email.email_content.trip_detection_status = 'pending'
-                    email.email_content.trip_detection_error = None
+            db.query(EmailContent).filter(
+                EmailContent.email_id.in_([email.email_id for email in emails])
+            ).update({
+                EmailContent.trip_detection_status: 'pending',
+                EmailContent.trip_detection_error: None
+            }, synchronize_session=False)
             db.commit()
             logger.info(f"Reset {len(emails)} emails to pending status")
         except Exception as e:
@@ -527,28 +556,26 @@ class TripDetectionService:
             
             # Reset all email trip detection status
             # Reset all travel emails with completed booking extraction
-            # First get the email IDs that need to be reset
-            email_ids_to_reset = db.query(Email.email_id).join(EmailContent).filter(
+            # Select the email IDs that need to be reset as a subquery of the update
+            email_ids = select(Email.email_id).join(EmailContent).where(
                 Email.classification.in_(TRAVEL_CATEGORIES),
                 EmailContent.extraction_status == 'completed',
                 EmailContent.booking_extraction_status.in_(['completed', 'no_booking'])
-            ).all()
-            
-            email_ids = [e[0] for e in email_ids_to_reset]
+            )
             
             # Then update the EmailContent records
-            if email_ids:
-                reset_count = db.query(EmailContent).filter(
-                    EmailContent.email_id.in_(email_ids)
-                ).update({
-                    EmailContent.trip_detection_status: 'pending',
-                    EmailContent.trip_detection_error: None
-                }, synchronize_session=False)
-            else:
-                reset_count = 0
+            reset_count = db.query(EmailContent).filter(
+                EmailContent.email_id.in_(email_ids)
+            ).update({
+                EmailContent.trip_detection_status: 'pending',
+                EmailContent.trip_detection_error: None
+            }, synchronize_session=False)
             
             db.commit()
             
+            # Give previously invalid emails another chance after a full reset
+            self._invalid_booking_keys.clear()
+            
             logger.info(f"Reset trip detection status for {reset_count} emails and cleared all trips")
             return {
                 "success": True,
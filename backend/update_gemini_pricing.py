@@ -5,14 +5,19 @@ Update Gemini pricing configuration
 import os
 import json
 import sys
-from datetime import datetime
+
+# Pricing config location, shared by update and show
+PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
+CONFIG_PATH = os.path.join(PROJECT_ROOT, 'config', 'gemini_pricing.json')
 
 def update_pricing_config():
     """Update pricing configuration with latest values"""
+    # Only the update path needs datetime, so viewing pricing does not import it
+    from datetime import datetime
     
-    # Get config path
-    project_root = os.path.dirname(os.path.dirname(__file__))
-    config_path = os.path.join(project_root, 'config', 'gemini_pricing.json')
+    # Take the time once so every entry carries the same date
+    now = datetime.now()
+    today = now.strftime("%Y-%m-%d")
     
     # Latest pricing from https://ai.google.dev/gemini-api/docs/pricing
     updated_pricing = {
@@ -22,7 +27,7 @@ def update_pricing_config():
                 "output_cost_per_1m_tokens": 2.50,
                 "description": "Most cost-effective model for simple tasks",
                 "free_tier": True,
-                "updated": datetime.now().strftime("%Y-%m-%d")
+                "updated": today
             },
             "gemini-2.5-pro": {
                 "input_cost_per_1m_tokens_small": 1.25,
@@ -32,21 +37,21 @@ def update_pricing_config():
                 "context_threshold": 200000,
                 "description": "High-performance model for complex analysis",
                 "free_tier": True,
-                "updated": datetime.now().strftime("%Y-%m-%d")
+                "updated": today
             },
             "gemini-1.5-flash": {
                 "input_cost_per_1m_tokens": 0.075,
                 "output_cost_per_1m_tokens": 0.30,
                 "description": "Legacy flash model",
                 "free_tier": True,
-                "updated": datetime.now().strftime("%Y-%m-%d")
+                "updated": today
             },
             "gemini-2.0-flash": {
                 "input_cost_per_1m_tokens": 0.10,
                 "output_cost_per_1m_tokens": 0.40,
                 "description": "Latest flash model",
                 "free_tier": True,
-                "updated": datetime.now().strftime("%Y-%m-%d")
+                "updated": today
             }
         },
         "currency": "USD",
@@ -57,25 +62,22 @@ def update_pricing_config():
             "Prices subject to change - check official documentation"
         ],
         "source": "https://ai.google.dev/gemini-api/docs/pricing",
-        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        "last_updated": now.strftime("%Y-%m-%d %H:%M:%S")
     }
     
     try:
-        # Load existing config if it exists
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                existing_config = json.load(f)
+        # The existing config is replaced wholesale, so only check whether it exists
+        if os.path.exists(CONFIG_PATH):
             print(f"Existing config found, updating...")
         else:
-            existing_config = {}
             print(f"Creating new pricing config...")
         
         # Write updated config
-        with open(config_path, 'w') as f:
+        with open(CONFIG_PATH, 'w') as f:
             json.dump(updated_pricing, f, indent=2)
         
         print(f"✅ Pricing configuration updated successfully!")
-        print(f"Config location: {config_path}")
+        print(f"Config location: {CONFIG_PATH}")
         print(f"Last updated: {updated_pricing['last_updated']}")
         
         # Display current pricing
@@ -99,15 +101,12 @@ def update_pricing_config():
 
 def show_pricing_info():
     """Show current pricing information"""
-    project_root = os.path.dirname(os.path.dirname(__file__))
-    config_path = os.path.join(project_root, 'config', 'gemini_pricing.json')
-    
-    if not os.path.exists(config_path):
+    if not os.path.exists(CONFIG_PATH):
         print("❌ Pricing config not found. Run with --update to create it.")
         return
     
     try:
-        with open(config_path, 'r') as f:
+        with open(CONFIG_PATH, 'r') as f:
             config = json.load(f)
         
         print("📊 Current Gemini Pricing Configuration")
@@ -338,12 +338,27 @@ class EmailImportApp {
     }
 
     startProgressMonitoring() {
-        this.progressInterval = setInterval(async () => {
-            await this.updateProgress();
-        }, 1000);
+        // The server pushes progress updates over Server-Sent Events
+        this.progressSource = new EventSource('/api/emails/import/progress/stream');
+        this.progressSource.onmessage = (event) => {
+            this.handleProgress(JSON.parse(event.data));
+        };
+        this.progressSource.onerror = () => {
+            // Connection lost while importing: fall back to polling
+            this.stopProgressMonitoring();
+            if (this.isImporting) {
+                this.progressInterval = setInterval(async () => {
+                    await this.updateProgress();
+                }, 1000);
+            }
+        };
     }
 
     stopProgressMonitoring() {
+        if (this.progressSource) {
+            this.progressSource.close();
+            this.progressSource = null;
+        }
         if (this.progressInterval) {
             clearInterval(this.progressInterval);
             this.progressInterval = null;
@@ -358,22 +373,26 @@ class EmailImportApp {
             const data = await response.json();
 
             if (response.ok) {
-                this.displayProgress(data);
+                this.handleProgress(data);
+            }
+        } catch (error) {
+            console.error('Progress update error:', error);
+        }
+    }
 
-                // Check if finished
-                if (data.finished) {
-                    this.isImporting = false;
-                    this.stopProgressMonitoring();
+    handleProgress(data) {
+        this.displayProgress(data);
 
-                    if (data.final_results) {
-                        this.displayResults(data.final_results);
-                    }
+        // Check if finished
+        if (data.finished) {
+            this.isImporting = false;
+            this.stopProgressMonitoring();
 
-                    this.updateUIForImporting(false);
-                }
+            if (data.final_results) {
+                this.displayResults(data.final_results);
             }
-        } catch (error) {
-            console.error('Progress update error:', error);
+
+            this.updateUIForImporting(false);
         }
     }
 
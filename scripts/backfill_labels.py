@@ -5,6 +5,7 @@ import json
 import logging
 import time
 from typing import List, Dict
+from sqlalchemy import update
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -26,10 +27,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def backfill_labels(batch_size: int = 50):
+def backfill_labels(batch_size: int = 100, max_workers: int = 4):
     """
     Backfill labels for emails that don't have them.
-    Uses batch processing for efficiency.
+    Uses batch processing for efficiency: each round fetches max_workers
+    Gmail batch requests of batch_size emails concurrently.
     """
     db = SessionLocal()
     try:
@@ -44,50 +46,47 @@ def backfill_labels(batch_size: int = 50):
         
         processed_count = 0
         updated_count = 0
+        # One Gmail batch request per worker is in flight per round
+        round_size = batch_size * max_workers
         
         while True:
-            # Get a batch of emails with missing labels
-            emails = db.query(Email).filter(Email.labels == None).limit(batch_size).all()
+            # Get a round of emails with missing labels (only the key columns are needed)
+            emails = db.query(Email.id, Email.email_id).filter(Email.labels == None).order_by(Email.id).limit(round_size).all()
             
             if not emails:
                 break
             
             email_ids = [email.email_id for email in emails]
-            email_map = {email.email_id: email for email in emails}
             
             logger.info(f"Processing batch of {len(email_ids)} emails ({processed_count}/{total_count})...")
             
             try:
                 # Use batch_get_headers for efficiency
                 # Note: batch_get_headers returns a list of dicts with 'email_id' and 'label_names'
-                headers_list = client.batch_get_headers(email_ids, batch_size=batch_size)
+                headers_list = client.batch_get_headers(email_ids, batch_size=batch_size, max_workers=max_workers)
                 
                 # Create a map of results
                 results_map = {h['email_id']: h.get('label_names', []) for h in headers_list}
                 
-                # Update database records
-                for email_id in email_ids:
-                    email = email_map[email_id]
-                    
-                    if email_id in results_map:
-                        label_names = results_map[email_id]
+                # Build one primary-key update mapping per email
+                mappings = []
+                for email in emails:
+                    if email.email_id in results_map:
                         # Always set labels, even if empty list, to mark as processed (empty list vs None)
-                        # But wait, if we set to "[]", it's not None anymore.
-                        labels_json = json.dumps(label_names)
-                        email.labels = labels_json
+                        labels_json = json.dumps(results_map[email.email_id])
                         updated_count += 1
                     else:
-                        # If we couldn't fetch it (e.g. deleted), maybe mark as processed with empty labels?
-                        # Or leave as None? If we leave as None, we'll pick it up again.
-                        # Let's set to empty list to avoid infinite loop
-                        logger.warning(f"Could not fetch headers for {email_id}, setting empty labels")
-                        email.labels = "[]"
+                        # If we couldn't fetch it (e.g. deleted), set empty labels so that
+                        # it is not picked up again, avoiding an infinite loop
+                        logger.warning(f"Could not fetch headers for {email.email_id}, setting empty labels")
+                        labels_json = "[]"
+                    mappings.append({'id': email.id, 'labels': labels_json})
                 
+                # Update the whole round with a single executemany UPDATE
+                db.execute(update(Email), mappings)
                 db.commit()
                 processed_count += len(emails)
-                
-                # Rate limiting to be nice to Gmail API
-                time.sleep(0.5)
+                # No fixed sleep: batch_get_headers backs off and retries when Gmail rate limits
                 
             except Exception as e:
                 logger.error(f"Error processing batch: {e}")
@@ -104,5 +103,5 @@ def backfill_labels(batch_size: int = 50):
         db.close()
 
 if __name__ == "__main__":
-    # You can adjust batch size if needed
-    backfill_labels(batch_size=50)
+    # You can adjust batch size and concurrency if needed
+    backfill_labels(batch_size=100, max_workers=4)
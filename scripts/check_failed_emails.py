@@ -1,6 +1,7 @@
 import sys
 from pathlib import Path
 import logging
+from sqlalchemy import func
 
 # Add project root to path
 project_root = Path(__file__).parent
@@ -16,26 +17,37 @@ logger = logging.getLogger(__name__)
 def check_failed_emails():
     db = SessionLocal()
     try:
-        failed_emails = db.query(Email, EmailContent).join(EmailContent).filter(
+        # Count failed emails per error message in the database
+        error_counts = db.query(
+            EmailContent.trip_detection_error, func.count(EmailContent.id)
+        ).filter(
             EmailContent.trip_detection_status == 'failed'
+        ).group_by(
+            EmailContent.trip_detection_error
+        ).order_by(
+            func.count(EmailContent.id).desc()
         ).all()
         
-        print(f"Found {len(failed_emails)} failed emails:")
+        # Build the report in memory and write it once instead of per line
+        out = [f"Found {sum(count for _, count in error_counts)} failed emails:"]
         
-        # Group by error message
-        errors = {}
-        for email, content in failed_emails:
-            error = content.trip_detection_error or "Unknown error"
-            if error not in errors:
-                errors[error] = []
-            errors[error].append(email.subject)
+        for error, count in error_counts:
+            # Only fetch the few subjects shown for each error
+            if error is None:
+                error_filter = EmailContent.trip_detection_error.is_(None)
+            else:
+                error_filter = EmailContent.trip_detection_error == error
+            samples = db.query(Email.subject).join(EmailContent).filter(
+                EmailContent.trip_detection_status == 'failed',
+                error_filter
+            ).limit(5).all()
             
-        for error, subjects in errors.items():
-            print(f"\nError: {error}")
-            print(f"Count: {len(subjects)}")
-            print("Sample Subjects:")
-            for subject in subjects[:5]:
-                print(f"  - {subject}")
+            out.append(f"\nError: {error or 'Unknown error'}")
+            out.append(f"Count: {count}")
+            out.append("Sample Subjects:")
+            out.extend(f"  - {subject}" for (subject,) in samples)
+        
+        sys.stdout.write("\n".join(out) + "\n")
                 
     except Exception as e:
         print(f"Error querying database: {e}")
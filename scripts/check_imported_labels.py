@@ -1,9 +1,11 @@
+import sys
 import sqlite3
 import json
 
 def check_recent_emails():
     try:
-        conn = sqlite3.connect('data/mytrips.db')
+        # Read-only connection: this script only inspects the database
+        conn = sqlite3.connect('file:data/mytrips.db?mode=ro', uri=True)
         cursor = conn.cursor()
         
         # Get the 5 most recent emails
@@ -16,16 +18,21 @@ def check_recent_emails():
         
         emails = cursor.fetchall()
         
-        print(f"Found {len(emails)} recent emails:")
-        print("-" * 120)
-        print(f"{'ID':<5} | {'Email ID':<20} | {'Created At':<25} | {'Labels':<20} | {'Subject':<40}")
-        print("-" * 120)
+        # Build the table in memory and write it once instead of per line
+        out = [
+            f"Found {len(emails)} recent emails:",
+            "-" * 120,
+            f"{'ID':<5} | {'Email ID':<20} | {'Created At':<25} | {'Labels':<20} | {'Subject':<40}",
+            "-" * 120
+        ]
         
         for email in emails:
             id, email_id, subject, labels, created_at = email
             subject_display = (subject[:37] + '...') if subject and len(subject) > 37 else subject
             labels_display = labels if labels else "None"
-            print(f"{id:<5} | {email_id:<20} | {created_at:<25} | {labels_display:<20} | {subject_display:<40}")
+            out.append(f"{id:<5} | {email_id:<20} | {created_at:<25} | {labels_display:<20} | {subject_display:<40}")
+        
+        sys.stdout.write("\n".join(out) + "\n")
             
         conn.close()
         
@@ -33,7 +33,7 @@ def debug_email_labels(email_id):
         print("\n3. Processing Labels...")
         label_names = []
         for label_id in raw_labels:
-            if label_id in ['INBOX', 'SENT', 'UNREAD', 'IMPORTANT']:
+            if label_id in client.SKIPPED_SYSTEM_LABELS:
                 print(f"  Skipping system label: {label_id}")
                 continue
             
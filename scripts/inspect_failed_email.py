@@ -9,6 +9,7 @@ sys.path.append(str(project_root))
 
 from backend.database.config import SessionLocal
 from backend.database.models import Email, EmailContent
+from backend.lib import serialization
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -17,19 +18,29 @@ logger = logging.getLogger(__name__)
 def inspect_failed_email():
     db = SessionLocal()
     try:
-        # Find the failed email
-        failed_email = db.query(Email, EmailContent).join(EmailContent).filter(
+        # Find the failed email, selecting only the columns shown (read-only, no ORM entities)
+        failed_email = db.query(
+            Email.subject,
+            EmailContent.trip_detection_error,
+            EmailContent.extracted_booking_info
+        ).join(EmailContent).filter(
             EmailContent.trip_detection_status == 'failed'
         ).first()
         
         if failed_email:
-            email, content = failed_email
-            print(f"Subject: {email.subject}")
-            print(f"Error: {content.trip_detection_error}")
+            print(f"Subject: {failed_email.subject}")
+            print(f"Error: {failed_email.trip_detection_error}")
             
-            if content.extracted_booking_info:
+            if failed_email.extracted_booking_info:
                 print("\nExtracted Booking Info:")
-                print(json.dumps(content.extracted_booking_info, indent=2, default=str))
+                try:
+                    booking_info = serialization.loads(failed_email.extracted_booking_info)
+                except ValueError as e:
+                    # Malformed stored JSON may be why detection failed; show it as stored
+                    print(f"(not valid JSON: {e})")
+                    print(failed_email.extracted_booking_info)
+                else:
+                    print(json.dumps(booking_info, indent=2, default=str))
             else:
                 print("\nNo extracted booking info found.")
         else:
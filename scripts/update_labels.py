@@ -35,22 +35,27 @@ def update_recent_labels(limit=10):
         
         updated_count = 0
         
+        # Fetch all headers with Gmail batch requests (100 messages per HTTP call)
+        headers_map = {
+            headers['email_id']: headers
+            for headers in client.batch_get_headers([email.email_id for email in emails])
+        }
+        
         for email in emails:
-            try:
-                print(f"Updating email {email.email_id}...")
-                headers = client.get_message_headers(email.email_id)
-                
-                label_names = headers.get('label_names', [])
-                if label_names:
-                    labels_json = json.dumps(label_names)
-                    email.labels = labels_json
-                    updated_count += 1
-                    print(f"  -> Set labels: {labels_json}")
-                else:
-                    print(f"  -> No labels found in Gmail")
-                    
-            except Exception as e:
-                print(f"  -> Failed: {e}")
+            print(f"Updating email {email.email_id}...")
+            headers = headers_map.get(email.email_id)
+            if headers is None:
+                print(f"  -> Failed: could not fetch headers")
+                continue
+            
+            label_names = headers.get('label_names', [])
+            if label_names:
+                labels_json = json.dumps(label_names)
+                email.labels = labels_json
+                updated_count += 1
+                print(f"  -> Set labels: {labels_json}")
+            else:
+                print(f"  -> No labels found in Gmail")
                 
         db.commit()
         print(f"\nSuccessfully updated {updated_count} emails.")
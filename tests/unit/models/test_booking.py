@@ -188,7 +188,20 @@ class TestBookingInfoJSONParsing:
             }]
         })
         assert incomplete_hotel.is_complete() is False
-        
+
+        # Car rental only needs pick-up info, other transport needs both ends
+        car_rental = BookingInfo.from_dict({
+            "booking_type": "car_rental",
+            "transport_segments": [{
+                "segment_type": "Car_Rental",
+                "departure_location": "Zurich Airport",
+                "departure_datetime": "2024-03-15T10:00:00"
+            }]
+        })
+        assert car_rental.is_complete() is True
+        car_rental.transport_segments[0]["segment_type"] = "train"
+        assert car_rental.is_complete() is False
+
         # No segments
         no_segments = BookingInfo.from_dict({
             "booking_type": "flight"
@@ -230,7 +243,17 @@ class TestBookingInfoJSONParsing:
             ]
         })
         assert zurich_activities.is_zurich_local_trip() is True
-    
+
+        # Matching is case-insensitive and tolerates missing locations
+        mixed_case_trip = BookingInfo.from_dict({
+            "booking_type": "train",
+            "transport_segments": [
+                {"departure_location": None, "arrival_location": "Zurich HB"},
+                {"departure_location": "ZÜRICH Flughafen", "arrival_location": "Dübendorf"}
+            ]
+        })
+        assert mixed_case_trip.is_zurich_local_trip() is True
+
     def test_test_booking_detection(self):
         """Test detection of test bookings"""
         # Test confirmation number
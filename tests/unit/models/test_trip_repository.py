@@ -0,0 +1,129 @@
+"""
+Unit tests for TripRepository
+"""
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import models as db_models
+from backend.models.repositories.trip_repository import TripRepository
+from backend.models.trip import Trip, TransportSegment, Accommodation
+
+
+class TestMergeTripData:
+    """Test merging AI-returned trip dictionaries into existing ones"""
+
+    def test_updates_existing_and_appends_new(self):
+        """Updated trips keep their position, new trips are appended"""
+        existing = [{"name": "Paris", "v": 1}, {"name": "London", "v": 1}]
+        new = [{"name": "London", "v": 2}, {"name": "Rome", "v": 1}]
+
+        merged = TripRepository.merge_trip_data(existing, new)
+
+        assert merged == [{"name": "Paris", "v": 1}, {"name": "London", "v": 2}, {"name": "Rome", "v": 1}]
+        # Input lists are not modified
+        assert existing == [{"name": "Paris", "v": 1}, {"name": "London", "v": 1}]
+
+    def test_duplicate_existing_names_replace_first_only(self):
+        """Existing trips sharing a name are not collapsed"""
+        existing = [{"name": "Paris", "v": 1}, {"name": "Paris", "v": 2}]
+
+        merged = TripRepository.merge_trip_data(existing, [{"name": "Paris", "v": 3}])
+
+        assert merged == [{"name": "Paris", "v": 3}, {"name": "Paris", "v": 2}]
+
+
+@pytest.fixture
+def session():
+    """Session on an empty in-memory SQLite database with two known emails"""
+    engine = create_engine('sqlite://')
+    db_models.Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([db_models.Email(email_id='email1'), db_models.Email(email_id='email2')])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def make_trip(name: str) -> Trip:
+    """Trip with one flight and one hotel, linked to known, duplicate and unknown emails"""
+    return Trip(
+        name=name,
+        start_date=datetime(2024, 3, 15),
+        end_date=datetime(2024, 3, 18),
+        transport_segments=[
+            TransportSegment(
+                segment_type="flight",
+                departure_location="Zurich",
+                arrival_location="Paris",
+                departure_datetime=datetime(2024, 3, 15, 10, 0),
+                arrival_datetime=datetime(2024, 3, 15, 11, 30),
+                related_email_ids=["email1", "email1", "unknown"]
+            )
+        ],
+        accommodations=[
+            Accommodation(
+                property_name="Hotel Le Marais",
+                check_in_date=datetime(2024, 3, 15),
+                check_out_date=datetime(2024, 3, 18),
+                related_email_ids=["email1", "email2"]
+            )
+        ]
+    )
+
+
+class TestReplaceAllTrips:
+    """Test replacing all trips with bulk-inserted trips and segments"""
+
+    def test_assigns_trip_and_segment_ids(self, session):
+        """Trips get their new IDs and every segment is stored under its trip"""
+        trips = [make_trip("Paris"), make_trip("Lyon")]
+
+        saved = TripRepository(session).replace_all_trips(trips)
+
+        assert saved == 2
+        assert all(trip.id for trip in trips)
+        assert len({trip.id for trip in trips}) == 2
+        for trip in trips:
+            db_trip = session.get(db_models.Trip, trip.id)
+            assert db_trip.name == trip.name
+            assert len(db_trip.transport_segments) == 1
+            assert len(db_trip.accommodations) == 1
+            assert db_trip.transport_segments[0].id is not None
+            assert db_trip.accommodations[0].id is not None
+
+    def test_email_links_deduplicated_and_unknown_skipped(self, session):
+        """Duplicate email IDs are linked once and unknown email IDs are skipped"""
+        trip = make_trip("Paris")
+
+        TripRepository(session).replace_all_trips([trip])
+
+        db_trip = session.get(db_models.Trip, trip.id)
+        segment_id = db_trip.transport_segments[0].id
+        segment_links = session.query(db_models.EmailTransportSegment.email_id).filter_by(
+            transport_segment_id=segment_id
+        ).all()
+        assert [row[0] for row in segment_links] == ["email1"]
+
+        accommodation_id = db_trip.accommodations[0].id
+        accommodation_links = session.query(db_models.EmailAccommodation.email_id).filter_by(
+            accommodation_id=accommodation_id
+        ).all()
+        assert sorted(row[0] for row in accommodation_links) == ["email1", "email2"]
+
+    def test_deletes_previous_trips(self, session):
+        """Trips, segments and email links from the previous set are removed"""
+        repository = TripRepository(session)
+        repository.replace_all_trips([make_trip("Paris"), make_trip("Lyon")])
+
+        new_trip = make_trip("Rome")
+        repository.replace_all_trips([new_trip])
+
+        assert [trip.name for trip in session.query(db_models.Trip).all()] == ["Rome"]
+        assert session.query(db_models.TransportSegment).count() == 1
+        assert session.query(db_models.Accommodation).count() == 1
+        assert session.query(db_models.EmailTransportSegment).count() == 1
+        assert session.query(db_models.EmailAccommodation).count() == 2
+        assert repository.find_by_id(new_trip.id).name == "Rome"